@@ -1,56 +1,152 @@
 import asyncio
 import logging
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.exceptions import ConfigEntryNotReady
 
 from .services import register_services
-from .device import register_device
+from .device import register_device, restore_device
+from .cache import PontosCache
 from .migrate import migrate_entry
 from .coordinator import PontosDataUpdateCoordinator
+from .command_queue import CommandQueue
+from .limiter import release_limiter
 from .const import DOMAIN, CONF_MAKE, MAKES
 
 LOGGER = logging.getLogger(__name__)
 
+# Entries are set up concurrently, but at most this many read their device at once
+MAX_CONCURRENT_FIRST_REFRESHES = 4
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     # Access which 'make' the user selected in config_flow
     make = entry.data.get(CONF_MAKE)
-    device_const = MAKES[make]
+    device_const = await MAKES.async_load(hass, make)
+
+    # Shared by all entries of the integration
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN].setdefault(
+        "first_refresh_limit", asyncio.Semaphore(MAX_CONCURRENT_FIRST_REFRESHES)
+    )
 
     # Set up the coordinator for data fetching
     coordinator = PontosDataUpdateCoordinator(hass, entry, device_const)
-    await coordinator.async_config_entry_first_refresh()
+
+    # Start from the last known state if there is one, otherwise from the device
+    cache = PontosCache(hass, entry)
+    cached = await cache.async_load()
+    if cached:
+        coordinator.async_set_cached_data(cached[0])
+    else:
+        async with hass.data[DOMAIN]["first_refresh_limit"]:
+            await coordinator.async_config_entry_first_refresh()
 
     # Store entries in hass.data
-    hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN].setdefault("entries", {})[entry.entry_id] = {
         "entry": entry,
         "coordinator": coordinator,
         "device_info": None,
-        "command_lock": asyncio.Lock(),
+        "command_queue": CommandQueue(hass, coordinator),
     }
 
     try:
         # Register the device
-        await register_device(hass, entry, coordinator)
+        if cached:
+            restore_device(hass, entry, cached[1])
+        else:
+            await register_device(hass, entry, coordinator)
     except Exception as e:
         LOGGER.error(f"Error setting up device: {e}")
         raise ConfigEntryNotReady from e
 
+    # Keep the cache up to date with every data update
+    @callback
+    def _update_cache():
+        entry_data = hass.data[DOMAIN]["entries"].get(entry.entry_id)
+        if entry_data and not coordinator.stale:
+            cache.async_save(coordinator.data, entry_data["device_info"])
+
+    entry.async_on_unload(coordinator.async_add_listener(_update_cache))
+    _update_cache()
+
+    if cached:
+        # Read the device without holding up Home Assistant startup
+        entry.async_create_background_task(
+            hass,
+            _async_refresh_cached(hass, entry, coordinator),
+            f"{DOMAIN} refresh {entry.entry_id}",
+        )
+
     # Register services
     await register_services(hass)
 
     # Forward entry setup to all platforms for this device
     platforms = getattr(device_const, "PLATFORMS", [])
-    hass.async_create_task(
-        hass.config_entries.async_forward_entry_setups(entry, platforms)
-    )
+    hass.async_create_task(_async_setup_platforms(hass, entry, coordinator, platforms))
 
     return True
 
 
+async def _async_refresh_cached(hass, entry, coordinator):
+    """Replace the cached data with the device's, and update the device registry."""
+    async with hass.data[DOMAIN]["first_refresh_limit"]:
+        await coordinator.async_refresh()
+    if not coordinator.stale:
+        await _async_update_device(hass, entry, coordinator)
+        return
+
+    LOGGER.warning(
+        f"Device at {coordinator.ip_address} did not answer yet, showing cached data"
+    )
+
+    # Update the device registry on the first data from the device instead
+    remove_listener = None
+
+    @callback
+    def _device_answered():
+        nonlocal remove_listener
+        if coordinator.stale or remove_listener is None:
+            return
+        remove_listener()
+        remove_listener = None
+        entry.async_create_background_task(
+            hass,
+            _async_update_device(hass, entry, coordinator),
+            f"{DOMAIN} update device {entry.entry_id}",
+        )
+
+    remove_listener = coordinator.async_add_listener(_device_answered)
+
+    @callback
+    def _remove_on_unload():
+        if remove_listener is not None:
+            remove_listener()
+
+    entry.async_on_unload(_remove_on_unload)
+
+
+async def _async_update_device(hass, entry, coordinator):
+    """Update the device registry from the device's data."""
+    try:
+        await register_device(hass, entry, coordinator)
+    except Exception as e:
+        LOGGER.error(f"Error updating device: {e}")
+
+
+async def _async_setup_platforms(hass, entry, coordinator, platforms):
+    """Set up all platforms, then let their entities finish initializing.
+
+    Entities of the platforms that did set up still wait for readiness, so it
+    is signalled even if setting up a platform failed.
+    """
+    try:
+        await hass.config_entries.async_forward_entry_setups(entry, platforms)
+    finally:
+        coordinator.async_set_ready()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     # Dynamically figure out which device_const file to unload from
     make = entry.data.get(CONF_MAKE)
@@ -67,10 +163,19 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     unload_ok = all(results)
 
     if unload_ok:
-        hass.data[DOMAIN]["entries"].pop(entry.entry_id, None)
+        entry_data = hass.data[DOMAIN]["entries"].pop(entry.entry_id, None)
+        if entry_data:
+            entry_data["command_queue"].async_shutdown()
+            await entry_data["coordinator"].async_shutdown()
+            release_limiter(hass, entry_data["coordinator"].ip_address)
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Delete the cached state of a removed entry."""
+    await PontosCache(hass, entry).async_remove()
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Handle config entry reload (triggered by options flow changes)."""
     await async_unload_entry(hass, entry)
@@ -0,0 +1,54 @@
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.util import slugify
+import logging
+
+from .const import DOMAIN
+
+LOGGER = logging.getLogger(__name__)
+
+# Diagnostics read from boolean coordinator attributes rather than from device data
+COORDINATOR_BINARY_SENSORS = {
+    "data_stale": {
+        "name": "Cached data",
+        "attribute": "stale",
+        "entity_category": EntityCategory.DIAGNOSTIC,
+    },
+}
+
+
+async def async_setup_entry(hass, entry, async_add_entities):
+    coordinator = hass.data[DOMAIN]["entries"][entry.entry_id]["coordinator"]
+    device_info = hass.data[DOMAIN]["entries"][entry.entry_id]["device_info"]
+
+    async_add_entities(
+        PontosCoordinatorBinarySensor(key, sensor_config, device_info, coordinator)
+        for key, sensor_config in COORDINATOR_BINARY_SENSORS.items()
+    )
+
+
+class PontosCoordinatorBinarySensor(CoordinatorEntity, BinarySensorEntity):
+    """Binary sensor exposing a boolean attribute of the coordinator itself."""
+
+    def __init__(self, key, sensor_config, device_info, coordinator):
+        super().__init__(coordinator)
+        self._attribute = sensor_config["attribute"]
+        self._attr_translation_key = key
+        self._attr_has_entity_name = True
+        self._attr_device_class = sensor_config.get("device_class", None)
+        self._attr_entity_category = sensor_config.get("entity_category", None)
+        self._attr_unique_id = slugify(
+            f"{device_info['serial_number']}_{sensor_config['name']}"
+        )
+        self._device_info = device_info
+
+    @property
+    def device_info(self):
+        return {
+            "identifiers": self._device_info["identifiers"],
+        }
+
+    @property
+    def is_on(self):
+        return getattr(self.coordinator, self._attribute)
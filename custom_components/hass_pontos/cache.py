@@ -0,0 +1,68 @@
+import logging
+
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# Coordinator data is written at most this often, and on Home Assistant shutdown
+SAVE_DELAY = 60
+
+# device_info values that are sets of tuples, stored as lists of lists
+DEVICE_INFO_SETS = ("identifiers", "connections")
+
+
+class PontosCache:
+    """Last known coordinator data and device_info of an entry, kept in a Store.
+
+    Lets the entry set up from the cache right away while the device is read
+    in the background.
+    """
+
+    def __init__(self, hass, entry):
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+        self._data = None
+        self._device_info = None
+
+    async def async_load(self):
+        """Return the cached (data, device_info), or None if nothing usable is cached."""
+        try:
+            cached = await self._store.async_load()
+        except Exception as err:
+            LOGGER.warning(f"Could not load cached device data: {err}")
+            return None
+
+        if not cached or not cached.get("data") or not cached.get("device_info"):
+            return None
+
+        device_info = dict(cached["device_info"])
+        for key in DEVICE_INFO_SETS:
+            device_info[key] = {tuple(item) for item in device_info.get(key, [])}
+
+        self._data = cached["data"]
+        self._device_info = device_info
+        return self._data, self._device_info
+
+    def async_save(self, data, device_info):
+        """Schedule writing the data, unless it is missing or already cached."""
+        if not data or not device_info:
+            return
+        if data == self._data and device_info == self._device_info:
+            return
+
+        self._data = data
+        self._device_info = device_info
+        self._store.async_delay_save(self._serialize, SAVE_DELAY)
+
+    def _serialize(self):
+        device_info = dict(self._device_info)
+        for key in DEVICE_INFO_SETS:
+            device_info[key] = [list(item) for item in device_info.get(key, ())]
+        return {"data": dict(self._data), "device_info": device_info}
+
+    async def async_remove(self):
+        """Delete the cache, e.g. when the entry is removed."""
+        await self._store.async_remove()
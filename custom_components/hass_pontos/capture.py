@@ -0,0 +1,129 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+import time
+from urllib.parse import urlsplit
+
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+LOGGER = logging.getLogger(__name__)
+
+CAPTURE_VERSION = 1
+
+# Recorded responses are appended to the capture file at most this often
+FLUSH_DELAY = 10
+
+
+class TrafficCapture:
+    """Raw responses of one device, appended to a gzip compressed NDJSON file.
+
+    The first line describes the capture (make, options, start time). Every
+    other line is one request: {"t": seconds since the start, "path": URL
+    path, "status": HTTP status or null if no response came, "ms": response
+    time, "body": body text}. A body equal to the previous one of the same
+    path is left out and marked "same" instead, which keeps polls of an idle
+    device small. testing/replay.py serves a capture back to the integration.
+    """
+
+    def __init__(self, hass, ip, path, header):
+        self.hass = hass
+        self.ip = ip
+        self.path = path
+        self._start = time.monotonic()
+        self._bodies = {}
+        self._lines = [
+            _dump(
+                {
+                    "capture": CAPTURE_VERSION,
+                    "started": dt_util.utcnow().isoformat(),
+                    **header,
+                }
+            )
+        ]
+        self._unsub_flush = None
+        self._write_lock = asyncio.Lock()
+
+    def started(self):
+        """Return the time a request starts, to pass to record()."""
+        return time.monotonic()
+
+    def record(self, url, started, status=None, body=None, error=None):
+        """Record the response (or failure) of a request started at `started`."""
+        parts = urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        line = {
+            "t": round(started - self._start, 3),
+            "path": path,
+            "status": status,
+            "ms": round((time.monotonic() - started) * 1000, 1),
+        }
+        if body is not None:
+            text = body.decode("utf-8", "replace")
+            if self._bodies.get(path) == text:
+                line["same"] = 1
+            else:
+                line["body"] = self._bodies[path] = text
+        if error is not None:
+            line["error"] = error
+        self._lines.append(_dump(line))
+
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self.hass, FLUSH_DELAY, self._async_scheduled_flush
+            )
+
+    async def _async_scheduled_flush(self, _now):
+        self._unsub_flush = None
+        await self.async_flush()
+
+    async def async_flush(self):
+        """Append the recorded lines to the capture file, in the executor."""
+        async with self._write_lock:
+            lines, self._lines = self._lines, []
+            if not lines:
+                return
+            try:
+                await self.hass.async_add_executor_job(self._write, lines)
+            except OSError as err:
+                LOGGER.error(f"Could not write traffic capture {self.path}: {err}")
+
+    def _write(self, lines):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Every flush adds a gzip member; readers decompress them as one stream
+        with gzip.open(self.path, "at", encoding="utf-8") as f:
+            f.writelines(lines)
+
+    async def async_close(self):
+        """Stop recording for the device and write what is left."""
+        captures = self.hass.data.get(DOMAIN, {}).get("captures", {})
+        if captures.get(self.ip) is self:
+            del captures[self.ip]
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        await self.async_flush()
+        LOGGER.info(f"Traffic capture of {self.ip} written to {self.path}")
+
+
+def start_capture(hass, ip, name, header):
+    """Record every request to the device at `ip` in <config>/hass_pontos/captures."""
+    stamp = dt_util.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    path = hass.config.path(DOMAIN, "captures", f"{name}_{stamp}.ndjson.gz")
+    capture = TrafficCapture(hass, ip, path, header)
+    hass.data.setdefault(DOMAIN, {}).setdefault("captures", {})[ip] = capture
+    LOGGER.info(f"Capturing traffic of {ip} to {path}")
+    return capture
+
+
+def get_capture(hass, ip):
+    """Return the capture recording the device at `ip`, or None."""
+    return hass.data.get(DOMAIN, {}).get("captures", {}).get(ip)
+
+
+def _dump(line):
+    return json.dumps(line, separators=(",", ":")) + "\n"
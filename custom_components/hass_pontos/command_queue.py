@@ -0,0 +1,157 @@
+import logging
+
+from .limiter import PRIORITY_COMMAND, PRIORITY_SAFETY
+
+LOGGER = logging.getLogger(__name__)
+
+
+class _QueuedCommand:
+    __slots__ = (
+        "send",
+        "coalesce_key",
+        "confirm_keys",
+        "priority",
+        "queued",
+        "futures",
+    )
+
+    def __init__(self, send, coalesce_key, confirm_keys, priority, queued, future):
+        self.send = send
+        self.coalesce_key = coalesce_key
+        self.confirm_keys = confirm_keys
+        self.priority = priority
+        self.queued = queued
+        self.futures = [future]
+
+
+class CommandQueue:
+    """Per-device queue sending commands to the device one at a time.
+
+    A command still waiting in the queue is superseded by a newer command with
+    the same coalesce key (last write wins). Commands without a coalesce key,
+    such as valve commands, are always sent, in the order they were queued.
+    Safety commands skip ahead of every pending coalescable command.
+
+    Values a command returns are applied to the coordinator data right away.
+    After each burst of commands the device is read back once: only the
+    confirm keys of the sent commands, or everything if any command has none.
+
+    The time from queueing a command until the device answered it is kept
+    as the coordinator's command_latency, in milliseconds. A `send` that
+    raises (e.g. the device did not answer) fails the command's futures and
+    records no latency.
+    """
+
+    def __init__(self, hass, coordinator):
+        self._hass = hass
+        self._coordinator = coordinator
+        self._pending = []
+        self._current = None
+        self._worker = None
+
+        # What to read back after the current burst
+        self._confirm_keys = set()
+        self._full_refresh = False
+
+    def async_submit(
+        self, send, coalesce_key=None, confirm_keys=None, priority=PRIORITY_COMMAND
+    ):
+        """Queue `send`, a coroutine function sending one command.
+
+        `send` may return a dict of data keys with the values the command set.
+        `confirm_keys` are the data keys to read back afterwards; None means
+        the command can affect anything and triggers a full refresh.
+        `priority` is the limiter priority the command is sent with.
+
+        Returns a future resolved once the command, or the command that
+        superseded it, has been sent.
+        """
+        future = self._hass.loop.create_future()
+        command = _QueuedCommand(
+            send, coalesce_key, confirm_keys, priority, self._hass.loop.time(), future
+        )
+
+        if coalesce_key is not None:
+            for queued in self._pending:
+                if queued.coalesce_key == coalesce_key:
+                    LOGGER.debug(f"Command '{coalesce_key}' superseded by a newer one")
+                    self._pending.remove(queued)
+                    command.futures[:0] = queued.futures
+                    command.queued = queued.queued
+                    break
+
+        if priority == PRIORITY_SAFETY:
+            # Keep the order of ordered commands, but overtake everything else
+            position = 0
+            for index, queued in enumerate(self._pending):
+                if queued.coalesce_key is None:
+                    position = index + 1
+            self._pending.insert(position, command)
+        else:
+            self._pending.append(command)
+
+        if self._worker is None:
+            self._worker = self._hass.async_create_task(self._async_run())
+
+        return future
+
+    async def _async_run(self):
+        """Send queued commands until the queue is empty, then read back once."""
+        while True:
+            while self._pending:
+                command = self._current = self._pending.pop(0)
+                if command.confirm_keys is None:
+                    self._full_refresh = True
+                else:
+                    self._confirm_keys.update(command.confirm_keys)
+
+                try:
+                    updates = await command.send()
+                except Exception as err:
+                    LOGGER.error(f"Error sending command: {err}")
+                    for future in command.futures:
+                        if not future.done():
+                            future.set_exception(err)
+                else:
+                    self._coordinator.command_latency = round(
+                        (self._hass.loop.time() - command.queued) * 1000
+                    )
+                    # Show the new state without waiting for the read back
+                    self._coordinator.async_set_command_data(updates)
+                    for future in command.futures:
+                        if not future.done():
+                            future.set_result(None)
+                self._current = None
+
+            await self._async_read_back()
+
+            # Commands queued during the refresh start another burst
+            if not self._pending:
+                break
+
+        self._worker = None
+
+    async def _async_read_back(self):
+        """Refresh what the last burst of commands may have changed."""
+        full_refresh, self._full_refresh = self._full_refresh, False
+        confirm_keys, self._confirm_keys = self._confirm_keys, set()
+
+        if full_refresh:
+            await self._coordinator.async_full_refresh()
+        elif confirm_keys:
+            await self._coordinator.async_confirm_keys(sorted(confirm_keys))
+
+    def async_shutdown(self):
+        """Cancel the worker and any commands that have not been sent yet."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+        if self._current is not None:
+            self._pending.insert(0, self._current)
+            self._current = None
+
+        for command in self._pending:
+            for future in command.futures:
+                future.cancel()
+        self._pending.clear()
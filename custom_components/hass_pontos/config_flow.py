@@ -3,12 +3,21 @@ from homeassistant import config_entries
 from homeassistant.core import callback
 
 from .utils import fetch_data
+from .limiter import release_limiter
 from .const import (
     DOMAIN,
     CONF_FETCH_INTERVAL,
     CONF_IP_ADDRESS,
     CONF_DEVICE_NAME,
     CONF_MAKE,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_FETCH_INTERVAL,
+    CONF_MAX_FETCH_INTERVAL,
+    CONF_FAST_POLLING,
+    CONF_DEDICATED_CONNECTION,
+    CONF_CAPTURE_TRAFFIC,
+    DEFAULT_MIN_FETCH_INTERVAL,
+    DEFAULT_MAX_FETCH_INTERVAL,
     MAKES,
 )
 
@@ -71,12 +80,14 @@ class PontosConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     async def _test_connection(self, ip_address: str, make: str) -> bool:
         """Test a connection to the selected device's URLs."""
-        device_const = MAKES.get(make)
-        if not device_const:
+        if make not in MAKES:
             return False
+        device_const = await MAKES.async_load(self.hass, make)
 
         url_list = device_const.URL_LIST  # Each make-specific file defines URL_LIST
-        data = await fetch_data(self.hass, ip_address, url_list)
+        preamble = getattr(device_const, "URL_PREAMBLE", [])
+        data = await fetch_data(self.hass, ip_address, url_list, preamble=preamble)
+        release_limiter(self.hass, ip_address)
         return bool(data)
 
     @staticmethod
@@ -96,7 +107,7 @@ class PontosOptionsFlowHandler(config_entries.OptionsFlow):
     async def async_step_init(self, user_input=None):
         """
         The first (and possibly only) step of the options flow.
-        We'll let the user change the IP address and fetch interval.
+        We'll let the user change the IP address and polling intervals.
         """
         errors = {}
 
@@ -108,7 +119,12 @@ class PontosOptionsFlowHandler(config_entries.OptionsFlow):
             )
             make = config_entry.data[CONF_MAKE]
 
-            if await self._test_connection(new_ip, make):
+            if (
+                user_input[CONF_MIN_FETCH_INTERVAL]
+                > user_input[CONF_MAX_FETCH_INTERVAL]
+            ):
+                errors["base"] = "invalid_interval_range"
+            elif await self._test_connection(new_ip, make):
                 # If valid, create (or update) the options
                 return self.async_create_entry(
                     title="",
@@ -121,6 +137,16 @@ class PontosOptionsFlowHandler(config_entries.OptionsFlow):
         config_entry = self.hass.config_entries.async_get_entry(self.config_entry_id)
         current_ip = config_entry.options.get(CONF_IP_ADDRESS)
         current_fetch_interval = config_entry.options.get(CONF_FETCH_INTERVAL, 10)
+        current_adaptive = config_entry.options.get(CONF_ADAPTIVE_POLLING, False)
+        current_min_interval = config_entry.options.get(
+            CONF_MIN_FETCH_INTERVAL, DEFAULT_MIN_FETCH_INTERVAL
+        )
+        current_max_interval = config_entry.options.get(
+            CONF_MAX_FETCH_INTERVAL, DEFAULT_MAX_FETCH_INTERVAL
+        )
+        current_fast = config_entry.options.get(CONF_FAST_POLLING, False)
+        current_dedicated = config_entry.options.get(CONF_DEDICATED_CONNECTION, False)
+        current_capture = config_entry.options.get(CONF_CAPTURE_TRAFFIC, False)
 
         return self.async_show_form(
             step_id="init",
@@ -130,6 +156,18 @@ class PontosOptionsFlowHandler(config_entries.OptionsFlow):
                     vol.Required(
                         CONF_FETCH_INTERVAL, default=current_fetch_interval
                     ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Required(CONF_ADAPTIVE_POLLING, default=current_adaptive): bool,
+                    vol.Required(
+                        CONF_MIN_FETCH_INTERVAL, default=current_min_interval
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Required(
+                        CONF_MAX_FETCH_INTERVAL, default=current_max_interval
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Required(CONF_FAST_POLLING, default=current_fast): bool,
+                    vol.Required(
+                        CONF_DEDICATED_CONNECTION, default=current_dedicated
+                    ): bool,
+                    vol.Required(CONF_CAPTURE_TRAFFIC, default=current_capture): bool,
                 }
             ),
             errors=errors,
@@ -137,12 +175,14 @@ class PontosOptionsFlowHandler(config_entries.OptionsFlow):
 
     async def _test_connection(self, ip_address: str, make: str) -> bool:
         """Test if we can successfully reach the device with the new IP."""
-        device_const = MAKES.get(make)
-        if not device_const:
+        if make not in MAKES:
             return False
+        device_const = await MAKES.async_load(self.hass, make)
 
         url_list = device_const.URL_LIST
-        data = await fetch_data(self.hass, ip_address, url_list)
+        preamble = getattr(device_const, "URL_PREAMBLE", [])
+        data = await fetch_data(self.hass, ip_address, url_list, preamble=preamble)
+        release_limiter(self.hass, ip_address)
         return bool(data)
 
     @staticmethod
@@ -1,19 +1,68 @@
-from .device_config import conf_pontos
-from .device_config import conf_trio
-from .device_config import conf_safetech
-from .device_config import conf_safetech_v4
-from .device_config import conf_neosoft
+import importlib
+from collections.abc import Mapping
+
+from .parser import get_parsers
 
 DOMAIN = "hass_pontos"
 CONF_IP_ADDRESS = "ip_address"
 CONF_DEVICE_NAME = "device_name"
 CONF_MAKE = "make"
 CONF_FETCH_INTERVAL = "fetch_interval"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MIN_FETCH_INTERVAL = "min_fetch_interval"
+CONF_MAX_FETCH_INTERVAL = "max_fetch_interval"
+CONF_FAST_POLLING = "fast_polling"
+CONF_DEDICATED_CONNECTION = "dedicated_connection"
+CONF_CAPTURE_TRAFFIC = "capture_traffic"
+
+DEFAULT_MIN_FETCH_INTERVAL = 2
+DEFAULT_MAX_FETCH_INTERVAL = 60
+
+
+class LazyMakes(Mapping):
+    """Make name -> device_config module, imported the first time the make is used."""
+
+    def __init__(self, modules):
+        self._modules = modules
+        self._loaded = {}
+
+    def __getitem__(self, make):
+        device_const = self._loaded.get(make)
+        if device_const is None:
+            device_const = self.load(make)
+        return device_const
+
+    def __contains__(self, make):
+        return make in self._modules
+
+    def __iter__(self):
+        return iter(self._modules)
+
+    def __len__(self):
+        return len(self._modules)
+
+    def load(self, make):
+        """Import a make's module and build its derived tables (blocking)."""
+        device_const = importlib.import_module(
+            f".device_config.{self._modules[make]}", __package__
+        )
+        get_parsers(device_const)
+        self._loaded[make] = device_const
+        return device_const
+
+    async def async_load(self, hass, make):
+        """Return a make's module, importing it in the executor on first use."""
+        if make in self._loaded:
+            return self._loaded[make]
+        return await hass.async_add_executor_job(self.load, make)
+
 
-MAKES = {
-    "Hansgrohe Pontos": conf_pontos,
-    "SYR Trio": conf_trio,
-    "SYR SafeTech+": conf_safetech,
-    "SYR SafeTech+ (Old firmware)": conf_safetech_v4,
-    "SYR NeoSoft": conf_neosoft,
-}
+MAKES = LazyMakes(
+    {
+        "Hansgrohe Pontos": "conf_pontos",
+        "SYR Trio": "conf_trio",
+        "SYR SafeTech+": "conf_safetech",
+        "SYR SafeTech+ (Old firmware)": "conf_safetech_v4",
+        "SYR NeoSoft": "conf_neosoft",
+    }
+)
@@ -1,13 +1,53 @@
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util, slugify
 from datetime import timedelta
 import logging
 import asyncio
+import hashlib
+import random
+import re
 
-from .utils import fetch_data
-from .const import CONF_DEVICE_NAME, CONF_IP_ADDRESS, CONF_FETCH_INTERVAL
+from .utils import fetch_endpoints, create_device_session, UNCHANGED
+from .capture import start_capture
+from .limiter import get_limiter, release_limiter, PRIORITY_POLL, PRIORITY_SLOW_POLL
+from .snapshot import DeviceData, get_data_index
+from .const import (
+    CONF_DEVICE_NAME,
+    CONF_MAKE,
+    CONF_IP_ADDRESS,
+    CONF_FETCH_INTERVAL,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_FETCH_INTERVAL,
+    CONF_MAX_FETCH_INTERVAL,
+    CONF_FAST_POLLING,
+    CONF_DEDICATED_CONNECTION,
+    CONF_CAPTURE_TRAFFIC,
+    DEFAULT_MIN_FETCH_INTERVAL,
+    DEFAULT_MAX_FETCH_INTERVAL,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Values from an endpoint that keeps failing are dropped after this many poll intervals
+STALE_AFTER_POLLS = 3
+
+# Keys without a fast poll tier are only refreshed through URL_LIST at this interval
+SLOW_POLL_INTERVAL = timedelta(minutes=5)
+
+# Adaptive polling treats a turbine pulse within this many seconds as ongoing flow
+RECENT_PULSE_SECONDS = 60
+VALVE_MOVING_CODES = ("11", "21")
+ACTIVITY_KEYS = ("getFLO", "getAVO", "getNPS", "getVLV")
+
+# Failed URLs are retried in separate refreshes with exponential backoff and jitter
+MAX_RETRIES = 3
+RETRY_BASE_DELAY = 1.0
+
+# Each poll interval is randomly stretched or shortened by up to this fraction
+POLL_JITTER = 0.1
+
 
 class PontosDataUpdateCoordinator(DataUpdateCoordinator):
     def __init__(self, hass, entry, device_const):
@@ -15,41 +55,556 @@ class PontosDataUpdateCoordinator(DataUpdateCoordinator):
         self.entry = entry
         self.device_name = entry.data[CONF_DEVICE_NAME]
         self.ip_address = entry.options[CONF_IP_ADDRESS]
+        self.base_url = device_const.BASE_URL
         self.url_list = device_const.URL_LIST
+        self.url_preamble = getattr(device_const, "URL_PREAMBLE", [])
+        self.device_const = device_const
         self._lock = asyncio.Lock()
 
+        # Only the data keys the make reads are decoded and kept
+        self._data_index = get_data_index(device_const, ACTIVITY_KEYS)
+
+        # With fast polling, fast-moving keys are polled every interval through
+        # their own get/<cmd> URL; fast_urls is empty while the option is off
+        self._fast_tier_urls = list(
+            dict.fromkeys(
+                f"{device_const.BASE_URL}get/{sensor['endpoint'][3:].lower()}"
+                for sensor in device_const.SENSOR_DETAILS.values()
+                if sensor.get("poll_tier") == "fast"
+            )
+        )
+        self.fast_urls = []
+        self.slow_poll_interval = getattr(
+            device_const, "SLOW_POLL_INTERVAL", SLOW_POLL_INTERVAL
+        )
+        self._full_poll = False
+
+        # Per-key and per-URL time of the last successful response
+        self.key_updated = {}
+        self._url_updated = {}
+        self._url_keys = {}
+
+        # Per-URL digest of the last response body, unchanged bodies are not decoded
+        self._url_digests = {}
+
+        # State of the retry refreshes scheduled after a failed poll
+        self._retry_count = 0
+        self._unsub_retry = None
+        self._retry_urls = None
+
+        # URLs that failed and have not answered since; retries stay used up until then
+        self._failing_urls = set()
+
+        # URLs for a targeted refresh (retry or command confirmation) instead of a poll
+        self._refresh_urls = None
+
+        # Listeners subscribe with the data keys they read; only changed keys notify
+        self._listener_index = None
+        self._notified_data = None
+        self._notified_available = None
+
+        # Set once every platform is set up and the first payload is published
+        self.ready = asyncio.Event()
+
+        # True while the data was restored from the cache and not yet from the device
+        self.stale = False
+
+        # The first regular poll is shifted by a per-entry phase, so that
+        # devices set up together do not keep polling in lockstep
+        self._phase = _phase(entry.entry_id)
+        self._phase_pending = True
+
+        # Dedicated aiohttp session for this device, None to use the shared one
+        self.session = None
+
+        # Milliseconds from queueing the last command until the device answered it
+        self.command_latency = None
+
+        # Recording of the device's raw responses, while the option is enabled
+        self.capture = None
+
+        # Rate limiter of the device's IP address, and listeners for its queue
+        self.limiter = None
+        self._limiter_ip = None
+        self._unsub_limiter = None
+        self._limiter_listeners = []
+
         super().__init__(
             hass,
             _LOGGER,
             name=f"{self.device_name} Coordinator",
             update_interval=timedelta(seconds=self.entry.options[CONF_FETCH_INTERVAL]),
         )
+        self._update_options()
 
     async def _async_update_data(self):
+        # A targeted refresh only requests its own URLs; any other refresh is a regular poll
+        targeted = self._refresh_urls
+        urls = targeted or self._poll_urls()
+        self._refresh_urls = None
+        if self._retry_urls is not None and set(self._retry_urls) <= set(urls):
+            # This refresh requests everything the pending retry was waiting for
+            self._cancel_retry()
+
         async with self._lock:
             self._update_options()
+            if not self.data:
+                # Unchanged responses need the previous data to fall back on
+                self._url_digests.clear()
             try:
-                data = await fetch_data(
+                responses = await fetch_endpoints(
                     self.hass,
                     self.ip_address,
-                    self.url_list,
-                    max_attempts=4,
-                    retry_delay=int(self.update_interval.total_seconds()),
+                    urls,
+                    preamble=self.url_preamble,
+                    session=self.session,
+                    priority={url: self._poll_priority(url) for url in urls},
+                    digests=self._url_digests,
+                    keys=self._data_index,
                 )
-                if not data:
-                    self.async_set_updated_data(None)
+                failed = [url for url in urls if url not in responses]
+                self._failing_urls.difference_update(responses)
+                self._failing_urls.update(failed)
+                if not self._failing_urls:
+                    # Every URL answers again, so the next failure gets its retries
+                    self._retry_count = 0
+
+                if failed and not responses and not self.data:
+                    # Nothing to fall back on, so report the failure right away
+                    raise UpdateFailed(
+                        f"No data received from device at {self.ip_address}"
+                    )
+                if failed and not self._schedule_retry(failed) and not responses:
+                    # Keep the previous data, only expiring values that are too old
+                    self.data = self._merge_responses(responses, urls)
                     raise UpdateFailed(
                         f"No data received from device at {self.ip_address}"
                     )
 
+                data = self._merge_responses(responses, urls)
+                self._adapt_update_interval(data)
+                if responses:
+                    self.stale = False
                 return data
 
+            except UpdateFailed:
+                raise
             except Exception as err:
-                self.async_set_updated_data(None)
                 raise UpdateFailed(f"Error fetching data: {err}")
 
-    def _update_options(self):
-        self.ip_address = self.entry.options[CONF_IP_ADDRESS]
-        self.update_interval = timedelta(
-            seconds=self.entry.options[CONF_FETCH_INTERVAL]
+    def _schedule_retry(self, failed):
+        """Schedule a short retry refresh for the failed URLs, without holding the lock."""
+        if self._retry_count >= MAX_RETRIES:
+            if self._retry_count > MAX_RETRIES:
+                # Already given up; wait until every URL answers again
+                return False
+            self._retry_count += 1
+            _LOGGER.error(
+                f"Giving up after {MAX_RETRIES} retries. No response from device for: {', '.join(url.format(ip=self.ip_address) for url in failed)}"
+            )
+            return False
+
+        if self._retry_urls is not None:
+            # Still waiting for an earlier retry, which these URLs join
+            failed = list(dict.fromkeys([*self._retry_urls, *failed]))
+            self._cancel_retry()
+
+        self._retry_count += 1
+        backoff = RETRY_BASE_DELAY * 2 ** (self._retry_count - 1)
+        delay = min(backoff, self.update_interval.total_seconds())
+        delay *= random.uniform(0.5, 1.0)
+
+        _LOGGER.warning(
+            f"Retry {self._retry_count}/{MAX_RETRIES} for {len(failed)} URL(s) in {delay:.1f} seconds"
+        )
+
+        async def _async_retry(_now):
+            self._unsub_retry = None
+            self._retry_urls = None
+            # Protected URLs need the admin unlock first, like in a regular poll
+            self._refresh_urls = list(dict.fromkeys(self.url_preamble + failed))
+            await self.async_refresh()
+
+        self._retry_urls = failed
+        self._unsub_retry = async_call_later(self.hass, delay, _async_retry)
+        return True
+
+    def _cancel_retry(self):
+        if self._unsub_retry is not None:
+            self._unsub_retry()
+            self._unsub_retry = None
+        self._retry_urls = None
+
+    @callback
+    def _schedule_refresh(self):
+        """Schedule the next regular poll, shifted by the entry's phase and jittered."""
+        interval = self.update_interval
+        if interval is None:
+            return super()._schedule_refresh()
+
+        delay = interval * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+        if self._phase_pending:
+            self._phase_pending = False
+            delay += interval * self._phase
+
+        # The base class schedules from update_interval, so lend it the delay
+        self.update_interval = delay
+        try:
+            super()._schedule_refresh()
+        finally:
+            self.update_interval = interval
+
+    @callback
+    def async_add_listener(self, update_callback, context=None):
+        """Listen for data updates, optionally only for the data keys in `context`.
+
+        Without a context (None) the listener gets every update; with an empty
+        one, only the first data and availability changes.
+        """
+        remove = super().async_add_listener(update_callback, context)
+        self._listener_index = None
+
+        @callback
+        def remove_listener():
+            remove()
+            self._listener_index = None
+
+        return remove_listener
+
+    @callback
+    def async_update_listeners(self):
+        """Notify only the listeners whose data keys changed since the last update."""
+        data = self.data or {}
+        previous = self._notified_data
+        available = (self.last_update_success, self.data is not None)
+
+        if previous is None or available != self._notified_available:
+            # First data or availability changed, every entity must refresh
+            listeners = [cb for cb, _ in list(self._listeners.values())]
+        elif data is previous:
+            # Every response was unchanged, only listeners without keys care
+            listeners = self._get_listener_index()[None]
+        else:
+            changed = _changed_keys(data, previous)
+            index = self._get_listener_index()
+            listeners = dict.fromkeys(index[None])
+            for key in changed:
+                listeners.update(dict.fromkeys(index.get(key, ())))
+
+        self._notified_data = data
+        self._notified_available = available
+
+        for update_callback in list(listeners):
+            update_callback()
+
+    def _get_listener_index(self):
+        """Return data key -> listeners, with listeners without context under None."""
+        if self._listener_index is None:
+            index = {None: []}
+            for update_callback, context in self._listeners.values():
+                # An empty context reads no keys, so it gets no entries at all
+                for key in (None,) if context is None else context:
+                    index.setdefault(key, []).append(update_callback)
+            self._listener_index = index
+        return self._listener_index
+
+    @callback
+    def async_set_cached_data(self, data):
+        """Publish data restored from the cache, marked stale until the device answers."""
+        self.stale = True
+        self.async_set_updated_data(DeviceData(self._data_index, data))
+
+    @callback
+    def async_set_ready(self):
+        """Signal readiness now, or as soon as the first payload is published."""
+        if self.data is not None:
+            self.ready.set()
+            return
+
+        @callback
+        def _first_data():
+            if self.data is not None:
+                remove_listener()
+                self.ready.set()
+
+        remove_listener = self.async_add_listener(_first_data)
+
+    async def async_shutdown(self):
+        """Cancel any pending retry, close the dedicated session and finish the capture."""
+        self._cancel_retry()
+        if self._unsub_limiter is not None:
+            self._unsub_limiter()
+            self._unsub_limiter = None
+        await super().async_shutdown()
+        if self.session is not None:
+            session, self.session = self.session, None
+            await session.close()
+        if self.capture is not None:
+            capture, self.capture = self.capture, None
+            await capture.async_close()
+
+    def _poll_urls(self):
+        """Return the URLs for a regular poll: fast keys always, URL_LIST entries when due."""
+        if not self.fast_urls:
+            return self.url_list
+        if not self.data or self._full_poll:
+            self._full_poll = False
+            return self.url_list + self.fast_urls
+
+        now = dt_util.utcnow()
+        due = [
+            url
+            for url in self.url_list
+            if url in self.url_preamble
+            or url not in self._url_updated
+            or now - self._url_updated[url] >= self.slow_poll_interval
+        ]
+        return due + self.fast_urls
+
+    async def async_full_refresh(self):
+        """Refresh every key, including the slow tier, e.g. after a command."""
+        self._full_poll = True
+        await self.async_refresh()
+
+    @callback
+    def async_set_command_data(self, updates):
+        """Apply values echoed by a command response before the device is read again."""
+        if not self.data or not updates:
+            return
+        if all(self.data.get(key) == value for key, value in updates.items()):
+            return
+        # The next read must replace these values even if the device ignored the command
+        self._url_digests.clear()
+        self.async_set_updated_data(
+            DeviceData(self._data_index, {**self.data, **updates})
+        )
+
+    async def async_confirm_keys(self, keys):
+        """Read back only the given data keys through their get/<cmd> URLs."""
+        urls = list(
+            dict.fromkeys(f"{self.base_url}get/{key[3:].lower()}" for key in keys)
         )
+        self._refresh_urls = self.url_preamble + urls
+        await self.async_refresh()
+
+    def _poll_interval(self, url):
+        """Return how often a URL is requested during regular polling."""
+        if self.fast_urls and url in self.url_list and url not in self.url_preamble:
+            return self.slow_poll_interval
+        return self.max_update_interval
+
+    def _poll_priority(self, url):
+        """Return the limiter priority of a URL; slow tier URLs yield to commands."""
+        if self.fast_urls and url in self.url_list and url not in self.url_preamble:
+            return PRIORITY_SLOW_POLL
+        return PRIORITY_POLL
+
+    def _merge_responses(self, responses, urls):
+        """Merge fresh responses into the previous data, keeping recent values of failed URLs.
+
+        Returns the previous data object itself when nothing changed.
+        """
+        now = dt_util.utcnow()
+        previous = self.data or {}
+        data = dict(previous)
+        changed = False
+
+        # Failed URLs keep their last values until they are too old to trust
+        for url in urls:
+            if url in responses or url not in self._url_updated:
+                continue
+            max_age = self._poll_interval(url) * STALE_AFTER_POLLS
+            if now - self._url_updated[url] > max_age:
+                _LOGGER.warning(f"Dropping stale values from {url}")
+                for key in self._url_keys.pop(url, ()):
+                    data.pop(key, None)
+                    self.key_updated.pop(key, None)
+                del self._url_updated[url]
+                self._url_digests.pop(url, None)
+                changed = True
+
+        # Apply fresh responses in request order so fast URLs override URL_LIST
+        for url in urls:
+            payload = responses.get(url)
+            if payload is None:
+                continue
+            keys = self._url_keys.get(url, ())
+            if payload is UNCHANGED:
+                # Still seen; restore its values in case an earlier URL overrode them
+                data.update((key, previous[key]) for key in keys if key in previous)
+            else:
+                data.update(payload)
+                keys = self._url_keys[url] = set(payload)
+                changed = True
+            self._url_updated[url] = now
+            self.key_updated.update(dict.fromkeys(keys, now))
+
+        return DeviceData(self._data_index, data) if changed else self.data
+
+    def _adapt_update_interval(self, data):
+        """Poll fast while water flows or the valve moves, back off gradually when idle."""
+        if not self.adaptive_polling:
+            return
+
+        if _is_active(data):
+            interval = self.min_update_interval
+        else:
+            interval = min(self.update_interval * 2, self.max_update_interval)
+
+        if interval != self.update_interval:
+            _LOGGER.debug(
+                f"Adaptive polling: interval {self.update_interval.total_seconds():.0f}s -> {interval.total_seconds():.0f}s"
+            )
+            self.update_interval = interval
+
+    @property
+    def effective_interval(self):
+        """Seconds between regular polls currently in use, e.g. after adaptive polling.
+
+        Each poll is scheduled this long after the previous one, stretched or
+        shortened by up to POLL_JITTER; the jitter is not included here.
+        """
+        return self.update_interval.total_seconds()
+
+    @property
+    def request_queue_depth(self):
+        """Requests to the device currently waiting for the rate limiter."""
+        return self.limiter.queue_depth
+
+    @property
+    def throttled_requests(self):
+        """Requests to the device that had to wait for the rate limiter."""
+        return self.limiter.throttled_requests
+
+    def _capture_header(self):
+        """Describe the device in a capture, so it can be replayed with the same options.
+
+        The IP address is left out, as replays serve the capture elsewhere.
+        """
+        return {
+            "make": self.entry.data[CONF_MAKE],
+            "device_name": self.device_name,
+            "options": {
+                key: value
+                for key, value in self.entry.options.items()
+                if key not in (CONF_IP_ADDRESS, CONF_CAPTURE_TRAFFIC)
+            },
+        }
+
+    def _update_limiter(self):
+        """Use the limiter of the current IP address, releasing the previous one."""
+        limiter = get_limiter(self.hass, self.ip_address, self.device_const)
+        if limiter is self.limiter:
+            return
+
+        if self._unsub_limiter is not None:
+            self._unsub_limiter()
+        self.limiter = limiter
+        self._unsub_limiter = limiter.add_listener(self._async_limiter_changed)
+
+        previous_ip, self._limiter_ip = self._limiter_ip, self.ip_address
+        if previous_ip is not None and previous_ip != self.ip_address:
+            release_limiter(self.hass, previous_ip)
+
+    @callback
+    def async_add_limiter_listener(self, update_callback):
+        """Call `update_callback` whenever the device's request queue changes."""
+        self._limiter_listeners.append(update_callback)
+
+        @callback
+        def remove_listener():
+            if update_callback in self._limiter_listeners:
+                self._limiter_listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_limiter_changed(self):
+        for update_callback in list(self._limiter_listeners):
+            update_callback()
+
+    def _update_options(self):
+        options = self.entry.options
+        self.ip_address = options[CONF_IP_ADDRESS]
+        self._update_limiter()
+        self.adaptive_polling = options.get(CONF_ADAPTIVE_POLLING, False)
+
+        # Off by default: it multiplies the requests of every poll
+        fast_polling = options.get(CONF_FAST_POLLING, False)
+        self.fast_urls = self._fast_tier_urls if fast_polling else []
+
+        dedicated = options.get(CONF_DEDICATED_CONNECTION, False)
+        if dedicated and self.session is None:
+            self.session = create_device_session()
+        elif not dedicated and self.session is not None:
+            session, self.session = self.session, None
+            self.hass.async_create_task(session.close())
+
+        capturing = options.get(CONF_CAPTURE_TRAFFIC, False)
+        if self.capture is not None and (
+            not capturing or self.capture.ip != self.ip_address
+        ):
+            capture, self.capture = self.capture, None
+            self.hass.async_create_task(capture.async_close())
+        if capturing and self.capture is None:
+            self.capture = start_capture(
+                self.hass,
+                self.ip_address,
+                slugify(self.device_name),
+                self._capture_header(),
+            )
+
+        if self.adaptive_polling:
+            self.min_update_interval = timedelta(
+                seconds=options.get(CONF_MIN_FETCH_INTERVAL, DEFAULT_MIN_FETCH_INTERVAL)
+            )
+            self.max_update_interval = timedelta(
+                seconds=options.get(CONF_MAX_FETCH_INTERVAL, DEFAULT_MAX_FETCH_INTERVAL)
+            )
+            self.update_interval = min(
+                max(self.update_interval, self.min_update_interval),
+                self.max_update_interval,
+            )
+        else:
+            self.update_interval = timedelta(seconds=options[CONF_FETCH_INTERVAL])
+            self.min_update_interval = self.update_interval
+            self.max_update_interval = self.update_interval
+
+
+def _phase(entry_id):
+    """Return a stable fraction in [0, 1) of the poll interval for an entry."""
+    digest = hashlib.sha1(entry_id.encode()).digest()
+    return int.from_bytes(digest[:4], "big") / 2**32
+
+
+def _changed_keys(data, previous):
+    """Return the keys whose value differs between two data snapshots."""
+    if isinstance(data, DeviceData):
+        return data.changed_keys(previous)
+    return {
+        key
+        for key in data.keys() | previous.keys()
+        if data.get(key) != previous.get(key)
+    }
+
+
+def _as_number(value):
+    """Extract a number from raw device values such as "1234mL", or None."""
+    try:
+        return float(re.sub(r"[^0-9.\-]", "", str(value)))
+    except ValueError:
+        return None
+
+
+def _is_active(data):
+    """Return True while water is flowing or the valve is opening/closing."""
+    flow = _as_number(data.get("getFLO"))
+    volume = _as_number(data.get("getAVO"))
+    no_pulse = _as_number(data.get("getNPS"))
+
+    return (
+        (flow is not None and flow > 0)
+        or (volume is not None and volume > 0)
+        or (no_pulse is not None and no_pulse < RECENT_PULSE_SECONDS)
+        or str(data.get("getVLV")) in VALVE_MOVING_CODES
+    )
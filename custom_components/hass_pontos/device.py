@@ -48,10 +48,14 @@ async def get_device_info(entry, coordinator):
 
 
 async def register_device(hass, entry, coordinator=None):
-    entry_id = entry.entry_id
-
     # Get device info (will raise exception if it fails)
     device_info = await get_device_info(entry, coordinator=coordinator)
+    restore_device(hass, entry, device_info)
+
+
+def restore_device(hass, entry, device_info):
+    """Register a device from known device_info, e.g. restored from the cache."""
+    entry_id = entry.entry_id
 
     # Store device_info for later use in platforms
     hass.data[DOMAIN]["entries"][entry_id]["device_info"] = device_info
@@ -1,7 +1,7 @@
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.components.sensor import SensorDeviceClass
 
-PLATFORMS = ["sensor", "button", "select", "switch", "time"]
+PLATFORMS = ["sensor", "binary_sensor", "button", "select", "switch", "time"]
 
 MODEL = "NeoSoft"
 MANUFACTURER = "SYR"
@@ -11,6 +11,10 @@ URL_ALL_DATA = f"{BASE_URL}get/all"
 
 URL_LIST = [URL_ALL_DATA]
 
+# Rate limit for all requests to the device: sustained requests per second and burst size
+REQUEST_RATE = 5.0
+REQUEST_BURST = 10
+
 ALARM_CODES = {
     "FF": "no_alarm",
     "A1": "alarm_end_switch",
@@ -75,6 +79,7 @@ SENSOR_DETAILS = {
     "total_consumption": {
         "name": "Total water consumption",
         "endpoint": "getVOL",
+        "poll_tier": "fast",
         "unit": "L",
         "device_class": SensorDeviceClass.WATER,
         "state_class": "total_increasing",
@@ -82,6 +87,7 @@ SENSOR_DETAILS = {
     "water_pressure": {
         "name": "Water pressure",
         "endpoint": "getBAR",
+        "poll_tier": "fast",
         "unit": "bar",
         "device_class": SensorDeviceClass.PRESSURE,
         "scale": 0.001,
@@ -108,6 +114,7 @@ SENSOR_DETAILS = {
     "water_flow": {
         "name": "Water flow",
         "endpoint": "getFLO",
+        "poll_tier": "fast",
         "unit": "L/h",
         "device_class": SensorDeviceClass.VOLUME_FLOW_RATE,
         "scale": 1,
@@ -115,6 +122,7 @@ SENSOR_DETAILS = {
     "current_consumption": {
         "name": "Current water consumption",
         "endpoint": "getAVO",
+        "poll_tier": "fast",
         "unit": "L",
         "device_class": SensorDeviceClass.WATER,
         "entity_category": EntityCategory.DIAGNOSTIC,
@@ -217,6 +225,7 @@ SENSOR_DETAILS = {
     "alarm_status": {
         "name": "Alarm status",
         "endpoint": "getALA",
+        "poll_tier": "fast",
         "code_dict": ALARM_CODES,
     },
     "warning_status": {
@@ -256,23 +265,46 @@ SERVICES = {
         "name": "Generic service call",
         "endpoint": "set/{endpoint}/{data}",
     },
-    "clear_alarms": {"name": "Clear alarms", "endpoint": "set/ala/255"},
-    "clear_warnings": {"name": "Clear warnings", "endpoint": "set/wrn/255"},
-    "clear_notifications": {"name": "Clear notifications", "endpoint": "set/not/255"},
+    "clear_alarms": {
+        "name": "Clear alarms",
+        "endpoint": "set/ala/255",
+        "confirm": ["getALA"],
+    },
+    "clear_warnings": {
+        "name": "Clear warnings",
+        "endpoint": "set/wrn/255",
+        "confirm": ["getWRN"],
+    },
+    "clear_notifications": {
+        "name": "Clear notifications",
+        "endpoint": "set/not/255",
+        "confirm": ["getNOT"],
+    },
     "set_regeneration_mode": {
         "name": "Set regeneration mode",
         "endpoint": "set/rmo/{data}",
+        "confirm": ["getRMO"],
     },
     "set_regeneration_interval": {
         "name": "Set regeneration interval",
         "endpoint": "set/rpd/{data}",
+        "confirm": ["getRPD"],
     },
     "set_regeneration_time": {
         "name": "Set regeneration time",
         "endpoint": "set/rtm/{data}",
+        "confirm": ["getRTM"],
+    },
+    "enable_buzzer": {
+        "name": "Enable buzzer",
+        "endpoint": "set/buz/true",
+        "confirm": ["getBUZ"],
+    },
+    "disable_buzzer": {
+        "name": "Disable buzzer",
+        "endpoint": "set/buz/false",
+        "confirm": ["getBUZ"],
     },
-    "enable_buzzer": {"name": "Enable buzzer", "endpoint": "set/buz/true"},
-    "disable_buzzer": {"name": "Disable buzzer", "endpoint": "set/buz/false"},
 }
 
 BUTTONS = {
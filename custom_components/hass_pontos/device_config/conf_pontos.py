@@ -7,7 +7,7 @@ from homeassistant.components.valve import (
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.components.sensor import SensorDeviceClass
 
-PLATFORMS = ["sensor", "button", "valve", "select"]
+PLATFORMS = ["sensor", "binary_sensor", "button", "valve", "select"]
 
 MODEL = "Pontos Base"
 MANUFACTURER = "Hansgrohe"
@@ -19,6 +19,13 @@ URL_ALL_DATA = f"{BASE_URL}get/all"
 
 URL_LIST = [URL_ADMIN, URL_CONDITION, URL_ALL_DATA]
 
+# Requested in order before the rest of URL_LIST, which is fetched concurrently
+URL_PREAMBLE = [URL_ADMIN]
+
+# Rate limit for all requests to the device: sustained requests per second and burst size
+REQUEST_RATE = 5.0
+REQUEST_BURST = 12
+
 ALARM_CODES = {
     "FF": "no_alarm",
     "A1": "alarm_end_switch",
@@ -48,6 +55,7 @@ SENSOR_DETAILS = {
     "total_consumption": {
         "name": "Total water consumption",
         "endpoint": "getVOL",
+        "poll_tier": "fast",
         "unit": "L",
         "device_class": SensorDeviceClass.WATER,
         "state_class": "total_increasing",
@@ -56,6 +64,7 @@ SENSOR_DETAILS = {
     "water_pressure": {
         "name": "Water pressure",
         "endpoint": "getBAR",
+        "poll_tier": "fast",
         "unit": "bar",
         "device_class": SensorDeviceClass.PRESSURE,
         "format_dict": {"mbar": ""},
@@ -71,11 +80,13 @@ SENSOR_DETAILS = {
     "no_pulse_time": {
         "name": "Time since last turbine pulse",
         "endpoint": "getNPS",
+        "poll_tier": "fast",
         "unit": "s",
     },
     "current_consumption": {
         "name": "Current water consumption",
         "endpoint": "getAVO",
+        "poll_tier": "fast",
         "unit": "L",
         "device_class": SensorDeviceClass.WATER,
         "format_dict": {"mL": ""},
@@ -141,6 +152,7 @@ SENSOR_DETAILS = {
     "alarm_status": {
         "name": "Alarm status",
         "endpoint": "getALA",
+        "poll_tier": "fast",
         "code_dict": ALARM_CODES,
     },
     "active_profile": {
@@ -151,6 +163,7 @@ SENSOR_DETAILS = {
     "valve_status": {
         "name": "Valve status",
         "endpoint": "getVLV",
+        "poll_tier": "fast",
         "code_dict": VALVE_CODES,
         "entity_category": EntityCategory.DIAGNOSTIC,
     },
@@ -278,10 +291,29 @@ SENSOR_DETAILS = {
 }
 
 SERVICES = {
-    "open_valve": {"name": "Open valve", "endpoint": "set/ab/1"},
-    "close_valve": {"name": "Close valve", "endpoint": "set/ab/2"},
-    "clear_alarms": {"name": "Clear alarms", "endpoint": "clr/ala"},
-    "set_profile": {"name": "Set Profile", "endpoint": "set/prf/{data}"},
+    "open_valve": {
+        "name": "Open valve",
+        "endpoint": "set/ab/1",
+        "ordered": True,
+        "response": {"getVLV": "getVLV"},
+    },
+    "close_valve": {
+        "name": "Close valve",
+        "endpoint": "set/ab/2",
+        "ordered": True,
+        "priority": "safety",
+        "response": {"getVLV": "getVLV"},
+    },
+    "clear_alarms": {
+        "name": "Clear alarms",
+        "endpoint": "clr/ala",
+        "confirm": ["getALA"],
+    },
+    "set_profile": {
+        "name": "Set Profile",
+        "endpoint": "set/prf/{data}",
+        "response": {"setPRF": "getPRF"},
+    },
     "generic_service": {
         "name": "Generic service call",
         "endpoint": "set/{endpoint}/{data}",
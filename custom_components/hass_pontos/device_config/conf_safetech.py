@@ -7,7 +7,7 @@ from homeassistant.components.valve import (
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.components.sensor import SensorDeviceClass
 
-PLATFORMS = ["sensor", "button", "valve", "select", "time"]
+PLATFORMS = ["sensor", "binary_sensor", "button", "valve", "select", "time"]
 
 MODEL = "SafeTech+"
 MANUFACTURER = "SYR"
@@ -17,6 +17,10 @@ URL_ALL_DATA = f"{BASE_URL}get/all"
 
 URL_LIST = [URL_ALL_DATA]
 
+# Rate limit for all requests to the device: sustained requests per second and burst size
+REQUEST_RATE = 5.0
+REQUEST_BURST = 10
+
 ALARM_CODES = {
     "FF": "no_alarm",
     "A1": "alarm_end_switch",
@@ -61,6 +65,7 @@ SENSOR_DETAILS = {
     "total_consumption": {
         "name": "Total water consumption",
         "endpoint": "getVOL",
+        "poll_tier": "fast",
         "unit": "L",
         "device_class": SensorDeviceClass.WATER,
         "state_class": "total_increasing",
@@ -68,6 +73,7 @@ SENSOR_DETAILS = {
     "water_pressure": {
         "name": "Water pressure",
         "endpoint": "getBAR",
+        "poll_tier": "fast",
         "unit": "bar",
         "device_class": SensorDeviceClass.PRESSURE,
         "scale": 0.001,
@@ -82,6 +88,7 @@ SENSOR_DETAILS = {
     "water_flow": {
         "name": "Water flow",
         "endpoint": "getFLO",
+        "poll_tier": "fast",
         "unit": "L/h",
         "device_class": SensorDeviceClass.VOLUME_FLOW_RATE,
         "scale": 1,
@@ -89,11 +96,13 @@ SENSOR_DETAILS = {
     "no_pulse_time": {
         "name": "Time since last turbine pulse",
         "endpoint": "getNPS",
+        "poll_tier": "fast",
         "unit": "s",
     },
     "current_consumption": {
         "name": "Current water consumption",
         "endpoint": "getAVO",
+        "poll_tier": "fast",
         "unit": "L",
         "device_class": SensorDeviceClass.WATER,
         "entity_category": EntityCategory.DIAGNOSTIC,
@@ -158,6 +167,7 @@ SENSOR_DETAILS = {
     "alarm_status": {
         "name": "Alarm status",
         "endpoint": "getALA",
+        "poll_tier": "fast",
         "code_dict": ALARM_CODES,
     },
     "warning_status": {
@@ -178,6 +188,7 @@ SENSOR_DETAILS = {
     "valve_status": {
         "name": "Valve status",
         "endpoint": "getVLV",
+        "poll_tier": "fast",
         "code_dict": VALVE_CODES,
         "entity_category": EntityCategory.DIAGNOSTIC,
     },
@@ -332,20 +343,49 @@ SENSOR_DETAILS = {
 }
 
 SERVICES = {
-    "open_valve": {"name": "Open valve", "endpoint": "set/ab/false"},
-    "close_valve": {"name": "Close valve", "endpoint": "set/ab/true"},
-    "clear_alarms": {"name": "Clear alarms", "endpoint": "set/ala/255"},
-    "clear_warnings": {"name": "Clear warnings", "endpoint": "set/wrn/255"},
-    "clear_notifications": {"name": "Clear notifications", "endpoint": "set/not/255"},
-    "set_profile": {"name": "Set Profile", "endpoint": "set/prf/{data}"},
+    "open_valve": {
+        "name": "Open valve",
+        "endpoint": "set/ab/false",
+        "ordered": True,
+        "response": {"getVLV": "getVLV"},
+    },
+    "close_valve": {
+        "name": "Close valve",
+        "endpoint": "set/ab/true",
+        "ordered": True,
+        "priority": "safety",
+        "response": {"getVLV": "getVLV"},
+    },
+    "clear_alarms": {
+        "name": "Clear alarms",
+        "endpoint": "set/ala/255",
+        "confirm": ["getALA"],
+    },
+    "clear_warnings": {
+        "name": "Clear warnings",
+        "endpoint": "set/wrn/255",
+        "confirm": ["getWRN"],
+    },
+    "clear_notifications": {
+        "name": "Clear notifications",
+        "endpoint": "set/not/255",
+        "confirm": ["getNOT"],
+    },
+    "set_profile": {
+        "name": "Set Profile",
+        "endpoint": "set/prf/{data}",
+        "response": {"setPRF": "getPRF"},
+    },
     "microleakage_test": {"name": "Start microleakage test", "endpoint": "set/dex"},
     "microleakage_time": {
         "name": "Set microleakage test time",
         "endpoint": "set/dtt/{data}",
+        "confirm": ["getDTT"],
     },
     "microleakage_schedule": {
         "name": "Set microleakage test schedule",
         "endpoint": "set/drp/{data}",
+        "confirm": ["getDRP"],
     },
     "generic_service": {
         "name": "Generic service call",
@@ -7,7 +7,7 @@ from homeassistant.components.valve import (
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.components.sensor import SensorDeviceClass
 
-PLATFORMS = ["sensor", "button", "valve", "select"]
+PLATFORMS = ["sensor", "binary_sensor", "button", "valve", "select"]
 
 MODEL = "SafeTech+"
 MANUFACTURER = "SYR"
@@ -18,6 +18,13 @@ URL_ALL_DATA = f"{BASE_URL}get/all"
 
 URL_LIST = [URL_ADMIN, URL_ALL_DATA]
 
+# Requested in order before the rest of URL_LIST, which is fetched concurrently
+URL_PREAMBLE = [URL_ADMIN]
+
+# Rate limit for all requests to the device: sustained requests per second and burst size
+REQUEST_RATE = 5.0
+REQUEST_BURST = 12
+
 ALARM_CODES = {
     "FF": "no_alarm",
     "A1": "alarm_end_switch",
@@ -47,6 +54,7 @@ SENSOR_DETAILS = {
     "total_consumption": {
         "name": "Total water consumption",
         "endpoint": "getVOL",
+        "poll_tier": "fast",
         "unit": "L",
         "device_class": SensorDeviceClass.WATER,
         "state_class": "total_increasing",
@@ -55,6 +63,7 @@ SENSOR_DETAILS = {
     "water_pressure": {
         "name": "Water pressure",
         "endpoint": "getBAR",
+        "poll_tier": "fast",
         "unit": "bar",
         "device_class": SensorDeviceClass.PRESSURE,
         "format_dict": {"mbar": ""},
@@ -63,6 +72,7 @@ SENSOR_DETAILS = {
     "water_flow": {
         "name": "Water flow",
         "endpoint": "getFLO",
+        "poll_tier": "fast",
         "unit": "L/h",
         "device_class": SensorDeviceClass.VOLUME_FLOW_RATE,
         "scale": 1,
@@ -77,11 +87,13 @@ SENSOR_DETAILS = {
     "no_pulse_time": {
         "name": "Time since last turbine pulse",
         "endpoint": "getNPS",
+        "poll_tier": "fast",
         "unit": "s",
     },
     "current_consumption": {
         "name": "Current water consumption",
         "endpoint": "getAVO",
+        "poll_tier": "fast",
         "unit": "L",
         "device_class": SensorDeviceClass.WATER,
         "format_dict": {"mL": ""},
@@ -147,6 +159,7 @@ SENSOR_DETAILS = {
     "alarm_status": {
         "name": "Alarm status",
         "endpoint": "getALA",
+        "poll_tier": "fast",
         "code_dict": ALARM_CODES,
     },
     "active_profile": {
@@ -157,6 +170,7 @@ SENSOR_DETAILS = {
     "valve_status": {
         "name": "Valve status",
         "endpoint": "getVLV",
+        "poll_tier": "fast",
         "code_dict": VALVE_CODES,
         "entity_category": EntityCategory.DIAGNOSTIC,
     },
@@ -300,10 +314,29 @@ SENSOR_DETAILS = {
 }
 
 SERVICES = {
-    "open_valve": {"name": "Open valve", "endpoint": "set/ab/1"},
-    "close_valve": {"name": "Close valve", "endpoint": "set/ab/2"},
-    "clear_alarms": {"name": "Clear alarms", "endpoint": "clr/ala"},
-    "set_profile": {"name": "Set Profile", "endpoint": "set/prf/{data}"},
+    "open_valve": {
+        "name": "Open valve",
+        "endpoint": "set/ab/1",
+        "ordered": True,
+        "response": {"getVLV": "getVLV"},
+    },
+    "close_valve": {
+        "name": "Close valve",
+        "endpoint": "set/ab/2",
+        "ordered": True,
+        "priority": "safety",
+        "response": {"getVLV": "getVLV"},
+    },
+    "clear_alarms": {
+        "name": "Clear alarms",
+        "endpoint": "clr/ala",
+        "confirm": ["getALA"],
+    },
+    "set_profile": {
+        "name": "Set Profile",
+        "endpoint": "set/prf/{data}",
+        "response": {"setPRF": "getPRF"},
+    },
     "generic_service": {
         "name": "Generic service call",
         "endpoint": "set/{endpoint}/{data}",
@@ -7,7 +7,7 @@ from homeassistant.components.valve import (
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.components.sensor import SensorDeviceClass
 
-PLATFORMS = ["sensor", "button", "valve", "select"]
+PLATFORMS = ["sensor", "binary_sensor", "button", "valve", "select"]
 
 MODEL = "Trio"
 MANUFACTURER = "SYR"
@@ -17,6 +17,10 @@ URL_ALL_DATA = f"{BASE_URL}get/all"
 
 URL_LIST = [URL_ALL_DATA]
 
+# Rate limit for all requests to the device: sustained requests per second and burst size
+REQUEST_RATE = 5.0
+REQUEST_BURST = 10
+
 ALARM_CODES = {
     "FF": "no_alarm",
     "A1": "alarm_end_switch",
@@ -59,6 +63,7 @@ SENSOR_DETAILS = {
     "total_consumption": {
         "name": "Total water consumption",
         "endpoint": "getVOL",
+        "poll_tier": "fast",
         "unit": "L",
         "device_class": SensorDeviceClass.WATER,
         "state_class": "total_increasing",
@@ -66,11 +71,13 @@ SENSOR_DETAILS = {
     "no_pulse_time": {
         "name": "Time since last turbine pulse",
         "endpoint": "getNPS",
+        "poll_tier": "fast",
         "unit": "s",
     },
     "current_consumption": {
         "name": "Current water consumption",
         "endpoint": "getAVO",
+        "poll_tier": "fast",
         "unit": "L",
         "device_class": SensorDeviceClass.WATER,
         "entity_category": EntityCategory.DIAGNOSTIC,
@@ -135,6 +142,7 @@ SENSOR_DETAILS = {
     "alarm_status": {
         "name": "Alarm status",
         "endpoint": "getALA",
+        "poll_tier": "fast",
         "code_dict": ALARM_CODES,
     },
     "warning_status": {
@@ -155,6 +163,7 @@ SENSOR_DETAILS = {
     "valve_status": {
         "name": "Valve status",
         "endpoint": "getVLV",
+        "poll_tier": "fast",
         "code_dict": VALVE_CODES,
         "entity_category": EntityCategory.DIAGNOSTIC,
     },
@@ -287,10 +296,29 @@ SENSOR_DETAILS = {
 }
 
 SERVICES = {
-    "open_valve": {"name": "Open valve", "endpoint": "set/ab/false"},
-    "close_valve": {"name": "Close valve", "endpoint": "set/ab/true"},
-    "clear_alarms": {"name": "Clear alarms", "endpoint": "set/ala/255"},
-    "set_profile": {"name": "Set Profile", "endpoint": "set/prf/{data}"},
+    "open_valve": {
+        "name": "Open valve",
+        "endpoint": "set/ab/false",
+        "ordered": True,
+        "response": {"getVLV": "getVLV"},
+    },
+    "close_valve": {
+        "name": "Close valve",
+        "endpoint": "set/ab/true",
+        "ordered": True,
+        "priority": "safety",
+        "response": {"getVLV": "getVLV"},
+    },
+    "clear_alarms": {
+        "name": "Clear alarms",
+        "endpoint": "set/ala/255",
+        "confirm": ["getALA"],
+    },
+    "set_profile": {
+        "name": "Set Profile",
+        "endpoint": "set/prf/{data}",
+        "response": {"setPRF": "getPRF"},
+    },
     "generic_service": {
         "name": "Generic service call",
         "endpoint": "set/{endpoint}/{data}",
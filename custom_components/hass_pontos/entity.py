@@ -0,0 +1,98 @@
+import logging
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import slugify
+
+from .parser import get_parsers
+
+LOGGER = logging.getLogger(__name__)
+
+
+def resolve_sensor(device_const, reference):
+    """Return the SENSOR_DETAILS key of a sensor referenced by key or by name, or None."""
+    if reference in device_const.SENSOR_DETAILS:
+        return reference
+
+    slug = slugify(reference)
+    for key, sensor_config in device_const.SENSOR_DETAILS.items():
+        if slugify(sensor_config["name"]) == slug:
+            return key
+    return None
+
+
+class PontosEntity(CoordinatorEntity):
+    """Entity mirroring one or more sensors straight from the coordinator data.
+
+    Sensors are referenced like in the device configs, by SENSOR_DETAILS key or
+    by sensor name. The entity is only notified when their data keys change.
+    It starts reading them once the coordinator signals that every platform
+    of the entry is set up and has the first payload.
+    """
+
+    def __init__(self, coordinator, device_info, device_const, sensors):
+        parsers = get_parsers(device_const)
+        self._sensor_parsers = {}
+        self._sensor_endpoints = {}
+
+        for reference in sensors:
+            key = resolve_sensor(device_const, reference)
+            if key is None:
+                LOGGER.warning(f"Sensor '{reference}' not found")
+                continue
+            sensor_config = device_const.SENSOR_DETAILS[key]
+            self._sensor_parsers[reference] = parsers[key]
+            self._sensor_endpoints[reference] = sensor_config["endpoint"]
+
+        # Without sensors the context is empty: only availability changes notify
+        super().__init__(coordinator, frozenset(self._sensor_endpoints.values()))
+        self._device_info = device_info
+
+    def sensor_value(self, reference):
+        """Return the parsed value of a mirrored sensor, or None if unavailable."""
+        parser = self._sensor_parsers.get(reference)
+        if parser is None:
+            return None
+        return parser(self.coordinator.data or {})
+
+    def sensor_raw_value(self, reference):
+        """Return the unparsed data value of a mirrored sensor, or None."""
+        endpoint = self._sensor_endpoints.get(reference)
+        if endpoint is None:
+            return None
+        return (self.coordinator.data or {}).get(endpoint)
+
+    def _update_from_data(self):
+        """Update the entity from the current sensor values."""
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        if self.coordinator.ready.is_set():
+            self._update_from_data()
+            return
+
+        task = self.hass.async_create_background_task(
+            self._async_wait_ready(), f"{self.entity_id} wait for ready"
+        )
+        self.async_on_remove(task.cancel)
+
+    async def _async_wait_ready(self):
+        """Initialize from the data once, as soon as the entry is ready."""
+        await self.coordinator.ready.wait()
+        self._update_from_data()
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self):
+        # Updates before the entry is ready are covered by _async_wait_ready
+        if not self.coordinator.ready.is_set():
+            return
+        self._update_from_data()
+        super()._handle_coordinator_update()
+
+    @property
+    def device_info(self):
+        """Return device info to link this entity with the device."""
+        return {
+            "identifiers": self._device_info["identifiers"],
+        }
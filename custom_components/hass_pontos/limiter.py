@@ -0,0 +1,187 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+from .const import DOMAIN
+
+LOGGER = logging.getLogger(__name__)
+
+# Used for devices whose make does not define REQUEST_RATE / REQUEST_BURST
+DEFAULT_REQUEST_RATE = 5.0
+DEFAULT_REQUEST_BURST = 10
+
+# Request priorities, lower is served first
+PRIORITY_SAFETY = 0
+PRIORITY_COMMAND = 1
+PRIORITY_POLL = 2
+PRIORITY_SLOW_POLL = 3
+
+PRIORITIES = {
+    "safety": PRIORITY_SAFETY,
+    "command": PRIORITY_COMMAND,
+    "poll": PRIORITY_POLL,
+    "slow_poll": PRIORITY_SLOW_POLL,
+}
+
+# In-flight requests that a new request of a priority cancels to free the device
+PREEMPTS = {
+    PRIORITY_SAFETY: (PRIORITY_POLL, PRIORITY_SLOW_POLL),
+    PRIORITY_COMMAND: (PRIORITY_SLOW_POLL,),
+}
+
+
+class RateLimiter:
+    """Token bucket allowing `rate` requests per second in bursts of up to `burst`.
+
+    Waiting requests are served by priority, then in FIFO order. A safety or
+    command request also cancels in-flight requests it preempts (see PREEMPTS).
+    queue_depth counts the requests currently waiting, throttled_requests
+    those that had to wait for a token. Listeners are called once per event
+    loop iteration in which either changed.
+    """
+
+    def __init__(self, rate=DEFAULT_REQUEST_RATE, burst=DEFAULT_REQUEST_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._wakeup = None
+        self._in_flight = {}
+        self._preempted = set()
+        self.queue_depth = 0
+        self.throttled_requests = 0
+        self.preempted_requests = 0
+        self._listeners = []
+        self._notify = None
+
+    def configure(self, rate, burst):
+        """Change the rate and burst, e.g. once the make of the device is known."""
+        self._refill()
+        self.rate = rate
+        self.burst = burst
+        self._tokens = min(self._tokens, burst)
+
+    def add_listener(self, listener):
+        """Call `listener` when queue_depth or throttled_requests change; returns a remover."""
+        self._listeners.append(listener)
+
+        def remove_listener():
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return remove_listener
+
+    def _changed(self):
+        if self._listeners and self._notify is None:
+            self._notify = asyncio.get_running_loop().call_soon(self._call_listeners)
+
+    def _call_listeners(self):
+        self._notify = None
+        for listener in list(self._listeners):
+            listener()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, priority=PRIORITY_POLL):
+        """Wait until a request of the given priority may be sent to the device."""
+        self._preempt(priority)
+
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+
+        self.throttled_requests += 1
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._schedule_wakeup()
+
+        self.queue_depth += 1
+        self._changed()
+        try:
+            await future
+        finally:
+            self.queue_depth -= 1
+            self._changed()
+
+    def _schedule_wakeup(self):
+        if self._wakeup is None:
+            delay = max(0.0, (1 - self._tokens) / self.rate)
+            self._wakeup = asyncio.get_running_loop().call_later(delay, self._release)
+
+    def _release(self):
+        """Hand the available tokens to the waiting requests, best priority first."""
+        self._wakeup = None
+        self._refill()
+        while self._waiters and self._tokens >= 1:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                # The waiting request was cancelled
+                continue
+            self._tokens -= 1
+            future.set_result(None)
+
+        if self._waiters:
+            self._schedule_wakeup()
+
+    def _preempt(self, priority):
+        """Cancel in-flight requests that a request of `priority` preempts."""
+        preempts = PREEMPTS.get(priority, ())
+        for request, other in list(self._in_flight.items()):
+            if other in preempts and not request.done():
+                LOGGER.debug("Preempting an in-flight request")
+                self._preempted.add(request)
+                self.preempted_requests += 1
+                request.cancel()
+
+    def track(self, request, priority):
+        """Register an in-flight request task, so that it can be preempted."""
+        self._in_flight[request] = priority
+
+    def untrack(self, request):
+        self._in_flight.pop(request, None)
+        self._preempted.discard(request)
+
+    def preempted(self, request):
+        """Return True if the request task was cancelled by a preempting request."""
+        return request in self._preempted
+
+
+def get_limiter(hass, ip, device_const=None):
+    """Return the rate limiter shared by every request to the device at `ip`.
+
+    With `device_const`, the limiter uses that make's REQUEST_RATE and
+    REQUEST_BURST.
+    """
+    limiters = hass.data.setdefault(DOMAIN, {}).setdefault("limiters", {})
+    limiter = limiters.get(ip)
+    if limiter is None:
+        limiter = limiters[ip] = RateLimiter()
+
+    if device_const is not None:
+        rate = getattr(device_const, "REQUEST_RATE", DEFAULT_REQUEST_RATE)
+        burst = getattr(device_const, "REQUEST_BURST", DEFAULT_REQUEST_BURST)
+        if (rate, burst) != (limiter.rate, limiter.burst):
+            limiter.configure(rate, burst)
+
+    return limiter
+
+
+def release_limiter(hass, ip):
+    """Forget the rate limiter of `ip` once no set up entry talks to that device.
+
+    Called when an entry is unloaded or moves to another IP address, and
+    after config flow connection tests.
+    """
+    domain_data = hass.data.get(DOMAIN, {})
+    for entry_data in domain_data.get("entries", {}).values():
+        if entry_data["coordinator"].ip_address == ip:
+            return
+    domain_data.get("limiters", {}).pop(ip, None)
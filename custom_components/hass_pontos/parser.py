@@ -0,0 +1,69 @@
+import re
+from functools import lru_cache
+
+
+def _compile_format(format_dict):
+    """Return a function applying all format_dict replacements in one pass."""
+    if len(format_dict) == 1:
+        ((old, new),) = format_dict.items()
+        return lambda value: value.replace(old, new)
+
+    # Longest first, so overlapping keys behave like the sequential replacements
+    pattern = re.compile(
+        "|".join(re.escape(old) for old in sorted(format_dict, key=len, reverse=True))
+    )
+    return lambda value: pattern.sub(lambda match: format_dict[match.group(0)], value)
+
+
+def compile_parser(sensor_config):
+    """Compile a SENSOR_DETAILS entry into a function: device data -> sensor value.
+
+    Returns None for missing values and device error strings, otherwise the value
+    after format replacements, code translation and scaling.
+    """
+    endpoint = sensor_config["endpoint"]
+    format_dict = sensor_config.get("format_dict", None)
+    code_dict = sensor_config.get("code_dict", None)
+    scale = sensor_config.get("scale", None)
+    apply_format = _compile_format(format_dict) if format_dict else None
+
+    def parse(data):
+        value = data.get(endpoint, None)
+
+        # If data is None, set to None and return
+        if value is None:
+            return None
+
+        # Convert to string for more consistent manipulation later
+        value = str(value)
+
+        # If the device returns some known error string (e.g., "ERROR: ADM"), mark sensor unavailable
+        if "ERROR" in value.upper():
+            return None
+
+        if apply_format is not None:
+            value = apply_format(value)
+
+        # Translate alarm codes if code_dict is present
+        if code_dict is not None:
+            value = code_dict.get(value.upper(), value)
+
+        # Scale sensor data if scale is present
+        if scale is not None:
+            try:
+                value = round(float(value) * scale, 2)
+            except (ValueError, TypeError):
+                pass
+
+        return value
+
+    return parse
+
+
+@lru_cache(maxsize=None)
+def get_parsers(device_const):
+    """Return the compiled parsers for every sensor of a make, built once per make."""
+    return {
+        key: compile_parser(sensor_config)
+        for key, sensor_config in device_const.SENSOR_DETAILS.items()
+    }
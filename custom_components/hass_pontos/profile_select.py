@@ -1,26 +1,28 @@
 import logging
 from homeassistant.components.select import SelectEntity
-from homeassistant.helpers import entity_registry as er
-from homeassistant.helpers.event import async_call_later, async_track_state_change_event
-from homeassistant.const import STATE_UNAVAILABLE
-from homeassistant.core import callback, Event
 from homeassistant.util import slugify
 
-from .const import DOMAIN, CONF_IP_ADDRESS
+from .const import DOMAIN, CONF_MAKE, MAKES
+from .entity import PontosEntity
 
 LOGGER = logging.getLogger(__name__)
 
+# The device supports up to 8 profiles
+PROFILE_CODES = range(1, 9)
+
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up the custom profile select entity."""
+    device_const = MAKES[entry.data.get(CONF_MAKE)]
+    coordinator = hass.data[DOMAIN]["entries"][entry.entry_id]["coordinator"]
     device_info = hass.data[DOMAIN]["entries"][entry.entry_id]["device_info"]
 
     # Instantiate the select entity
-    select_entity = PontosProfileSelect(hass, entry, device_info)
-    async_add_entities([select_entity], True)
+    select_entity = PontosProfileSelect(coordinator, entry, device_info, device_const)
+    async_add_entities([select_entity])
 
 
-class PontosProfileSelect(SelectEntity):
+class PontosProfileSelect(PontosEntity, SelectEntity):
     """
     A SelectEntity that:
       - Reads numeric codes (1..8) from the "active_profile" sensor.
@@ -28,11 +30,20 @@ class PontosProfileSelect(SelectEntity):
       - Calls set_profile with the numeric code when a user picks a name.
     """
 
-    def __init__(self, hass, entry, device_info):
+    def __init__(self, coordinator, entry, device_info, device_const):
         """Initialize the Pontos profile select entity."""
-        self._hass = hass
+        # The sensor that holds the numeric active profile code, and the
+        # sensor holding the name of each profile code
+        self._profile_name_sensors = {
+            code: f"profile_{code}_name" for code in PROFILE_CODES
+        }
+        super().__init__(
+            coordinator,
+            device_info,
+            device_const,
+            ["active_profile", *self._profile_name_sensors.values()],
+        )
         self._entry = entry
-        self._device_info = device_info
 
         # Construct entity metadata
         serial_number = device_info["serial_number"]
@@ -40,172 +51,81 @@ class PontosProfileSelect(SelectEntity):
         self._attr_has_entity_name = True
         self._attr_unique_id = slugify(f"{serial_number}_profile_select")
 
-        # The sensor that holds the numeric active profile code
-        self._active_profile_sensor_unique_id = slugify(
-            f"{serial_number}_active_profile"
-        )
-
-        # Track which entity_id corresponds to each profile code's name sensor
-        self._profile_name_entity_ids = {}
-
         # Start with an empty dropdown and no selected option
         self._attr_options = []
         self._attr_current_option = None
 
-    async def async_added_to_hass(self):
-        """When entity is added, set up registry lookups and listeners."""
-        await super().async_added_to_hass()
-        entity_registry = er.async_get(self._hass)
-
-        # 1) Locate the "active_profile" numeric sensor
-        active_sensor_id = entity_registry.async_get_entity_id(
-            "sensor", DOMAIN, self._active_profile_sensor_unique_id
-        )
-        LOGGER.debug(
-            f"Active profile sensor unique id: {self._active_profile_sensor_unique_id}"
-        )
-        LOGGER.debug(f"Active profile sensor name: {active_sensor_id}")
-
-        if active_sensor_id:
-            # Fetch its initial state
-            sensor_state_obj = self._hass.states.get(active_sensor_id)
-            initial_code_str = sensor_state_obj.state if sensor_state_obj else None
-            LOGGER.debug(
-                f"Fetched initial profile state from sensor: {initial_code_str}"
-            )
+        # Index of the profile labels, updated only for profiles whose raw
+        # name value changed since the last update
+        self._raw_names = {}
+        self._code_to_label = {}
+        self._label_to_code = {}
 
-            # Convert code -> name
-            self._attr_current_option = self._code_to_name(initial_code_str)
-            self.async_write_ha_state()
+    def _update_from_data(self):
+        """Update the changed profile labels and map the active code to its label."""
+        self._update_index()
 
-            # Listen for future changes
-            LOGGER.debug(f"Registering state change listener for {active_sensor_id}")
-            async_track_state_change_event(
-                self._hass, active_sensor_id, self._active_profile_changed
-            )
-        else:
-            LOGGER.error(
-                f"Sensor with unique ID {self._active_profile_sensor_unique_id} not found"
-            )
-
-        # 2) For each code 1..8, see if we have a name sensor
-        for code in range(1, 9):
-            profile_sensor_uid = slugify(
-                f"{self._device_info['serial_number']}_profile_{code}_name"
-            )
-            profile_sensor_entity_id = entity_registry.async_get_entity_id(
-                "sensor", DOMAIN, profile_sensor_uid
-            )
-            if profile_sensor_entity_id:
-                self._profile_name_entity_ids[code] = profile_sensor_entity_id
-                LOGGER.debug(
-                    f"Found dynamic name sensor for code {code}: {profile_sensor_entity_id}"
-                )
-                async_track_state_change_event(
-                    self._hass, profile_sensor_entity_id, self._profile_name_changed
-                )
-
-        # Build the dropdown from current sensor states
-        self._rebuild_options()
-        self.async_write_ha_state()
-
-        # After 2s, re-check in case no sensor state_changed was triggered
-        async_call_later(self._hass, 2.0, self._delayed_recheck)
-
-    @callback
-    def _delayed_recheck(self, _):
-        """
-        Called ~2s after startup to ensure name sensors are populated
-        and we can match numeric code => text label.
-        """
-        LOGGER.debug("Running delayed startup re-check for profile select.")
-        self._rebuild_options()
-        self.async_write_ha_state()
-
-        # Re-check the active_profile sensor in case it wasn't ready earlier
-        entity_registry = er.async_get(self._hass)
-        active_sensor_id = entity_registry.async_get_entity_id(
-            "sensor", DOMAIN, self._active_profile_sensor_unique_id
-        )
-        if active_sensor_id:
-            state_obj = self._hass.states.get(active_sensor_id)
-            if state_obj:
-                code_str = state_obj.state
-                new_name = self._code_to_name(code_str)
-                if new_name != self._attr_current_option:
-                    LOGGER.debug(f"Delayed check: code {code_str} => {new_name}")
-                    self.set_state(new_name)
-
-    @callback
-    def _active_profile_changed(self, event: Event):
-        """When the numeric code for active_profile changes, update the label in the UI."""
-        new_state_obj = event.data.get("new_state")
-        if not new_state_obj:
-            return
-
-        code_str = new_state_obj.state
+        code_str = self.sensor_value("active_profile")
         new_name = self._code_to_name(code_str)
         if new_name != self._attr_current_option:
             LOGGER.debug(
                 f"Active profile code changed => {code_str} => label '{new_name}'"
             )
-            self.set_state(new_name)
+            self._attr_current_option = new_name
 
     def set_state(self, new_label: str):
         """Set the currently selected label in the UI."""
         self._attr_current_option = new_label
         self.async_write_ha_state()
 
-    @callback
-    def _profile_name_changed(self, event: Event):
-        """When a user renames a profile or the sensor updates, rebuild the dropdown."""
-        self._rebuild_options()
-        self.async_write_ha_state()
-
-        # Also re-check the numeric code in case we can now map it to a label
-        entity_registry = er.async_get(self._hass)
-        active_sensor_id = entity_registry.async_get_entity_id(
-            "sensor", DOMAIN, self._active_profile_sensor_unique_id
-        )
-        if active_sensor_id:
-            state_obj = self._hass.states.get(active_sensor_id)
-            if state_obj:
-                code_str = state_obj.state
-                new_name = self._code_to_name(code_str)
-                if new_name != self._attr_current_option:
-                    LOGGER.debug(
-                        f"After name sensor updated, code {code_str} => {new_name}"
-                    )
-                    self.set_state(new_name)
+    def _profile_name(self, code):
+        """Return the stripped name of a profile, or None if empty/unavailable."""
+        name = self.sensor_value(self._profile_name_sensors[code])
+        if name is None:
+            return None
+        return str(name).strip() or None
 
-    def _rebuild_options(self):
+    def _update_index(self):
         """
-        Rebuild the dropdown from each profile_name_x sensor's current state,
-        skipping empties/unavailable.
+        Update the code <-> label index for the profiles whose name changed,
+        and rebuild the dropdown only if a label changed.
         """
-        new_options = []
-        for code, name_entity_id in self._profile_name_entity_ids.items():
-            state_obj = self._hass.states.get(name_entity_id)
-            if state_obj and state_obj.state not in (
-                "unknown",
-                "unavailable",
-                STATE_UNAVAILABLE,
-                "",
-                None,
-            ):
-                label = state_obj.state.strip()
-                if label:
-                    new_options.append(label)
-
-        self._attr_options = new_options
-        LOGGER.debug(f"Rebuilt profile options => {new_options}")
-
-        # If the current option is no longer valid, clear it out
-        if self._attr_current_option and self._attr_current_option not in new_options:
-            LOGGER.debug(
-                f"Current option '{self._attr_current_option}' not in new_options => clearing."
-            )
-            self._attr_current_option = None
+        changed = False
+        for code, sensor in self._profile_name_sensors.items():
+            raw_name = self.sensor_raw_value(sensor)
+            if code in self._raw_names and raw_name == self._raw_names[code]:
+                continue
+            self._raw_names[code] = raw_name
+
+            label = self._profile_name(code)
+            old_label = self._code_to_label.get(code)
+            if label == old_label:
+                continue
+            changed = True
+
+            if old_label is not None:
+                del self._code_to_label[code]
+                if self._label_to_code.get(old_label) == code:
+                    del self._label_to_code[old_label]
+                    # Another profile may carry the same name
+                    for other, other_label in sorted(self._code_to_label.items()):
+                        if other_label == old_label:
+                            self._label_to_code[old_label] = other
+                            break
+
+            if label is not None:
+                self._code_to_label[code] = label
+                if code < self._label_to_code.get(label, code + 1):
+                    self._label_to_code[label] = code
+
+        if changed:
+            # Options are listed in profile order, skipping empties/unavailable
+            self._attr_options = [
+                self._code_to_label[code]
+                for code in PROFILE_CODES
+                if code in self._code_to_label
+            ]
+            LOGGER.debug(f"Rebuilt profile options => {self._attr_options}")
 
     async def async_select_option(self, option: str):
         """
@@ -219,58 +139,35 @@ class PontosProfileSelect(SelectEntity):
             return
 
         LOGGER.debug(f"Mapping '{option}' => code {profile_number}")
-        await self._hass.services.async_call(
+        await self.hass.services.async_call(
             DOMAIN,
             "set_profile",
             {
                 "data": profile_number,
-                "ip_address": self._entry.options[CONF_IP_ADDRESS],
+                "entry_id": self._entry.entry_id,
             },
         )
         self.set_state(option)
 
     def _name_to_code(self, label: str):
-        """Return the profile code for the given label by scanning name sensors."""
-        for code, name_entity_id in self._profile_name_entity_ids.items():
-            state_obj = self._hass.states.get(name_entity_id)
-            if state_obj and state_obj.state == label:
-                return code
-        return None
+        """Return the profile code for the given label."""
+        return self._label_to_code.get(label)
 
-    def _code_to_name(self, code_str: str):
+    def _code_to_name(self, code_str):
         """
-        Convert a numeric code string (e.g. "2") to the text from sensor.my_device_profile_2_name.
-        Returns None if there's no match or the sensor is empty/unavailable.
+        Convert a numeric code (e.g. "2") to the name of that profile.
+        Returns None if there's no match or the name is empty/unavailable.
         """
-        if not code_str:
+        if code_str is None:
             return None
         try:
             code = int(code_str)
-        except ValueError:
+        except (ValueError, TypeError):
             return None
 
-        name_entity_id = self._profile_name_entity_ids.get(code)
-        if not name_entity_id:
-            return None
-
-        state_obj = self._hass.states.get(name_entity_id)
-        if state_obj and state_obj.state not in (
-            "unknown",
-            "unavailable",
-            STATE_UNAVAILABLE,
-            "",
-            None,
-        ):
-            return state_obj.state.strip()
-
-        return None
-
-    @property
-    def device_info(self):
-        """Link this select entity to the device registry entry."""
-        return {"identifiers": self._device_info["identifiers"]}
+        return self._code_to_label.get(code)
 
     @property
     def available(self):
-        """Entity is unavailable if the current option is STATE_UNAVAILABLE."""
-        return self._attr_current_option != None
+        """Entity is unavailable while the active profile has no label."""
+        return self._attr_current_option is not None
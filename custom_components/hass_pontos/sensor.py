@@ -1,30 +1,78 @@
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorDeviceClass,
+    SensorStateClass,
+)
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.util import slugify
 import logging
 
 from .const import CONF_MAKE, MAKES, DOMAIN
+from .parser import get_parsers
 
 LOGGER = logging.getLogger(__name__)
 
+# Diagnostics read from coordinator attributes rather than from device data
+COORDINATOR_SENSORS = {
+    "poll_interval": {
+        "name": "Poll interval",
+        "attribute": "effective_interval",
+        "entity_category": EntityCategory.DIAGNOSTIC,
+        "unit": "s",
+        "device_class": SensorDeviceClass.DURATION,
+    },
+    "request_queue_depth": {
+        "name": "Request queue depth",
+        "attribute": "request_queue_depth",
+        "entity_category": EntityCategory.DIAGNOSTIC,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "limiter": True,
+    },
+    "throttled_requests": {
+        "name": "Throttled requests",
+        "attribute": "throttled_requests",
+        "entity_category": EntityCategory.DIAGNOSTIC,
+        "state_class": SensorStateClass.TOTAL_INCREASING,
+        "limiter": True,
+    },
+    "command_latency": {
+        "name": "Command latency",
+        "attribute": "command_latency",
+        "entity_category": EntityCategory.DIAGNOSTIC,
+        "unit": "ms",
+        "device_class": SensorDeviceClass.DURATION,
+        "state_class": SensorStateClass.MEASUREMENT,
+    },
+}
+
 
 async def async_setup_entry(hass, entry, async_add_entities):
     make = entry.data.get(CONF_MAKE)
     device_const = MAKES[make]
     SENSOR_DETAILS = device_const.SENSOR_DETAILS
+    parsers = get_parsers(device_const)
     coordinator = hass.data[DOMAIN]["entries"][entry.entry_id]["coordinator"]
     device_info = hass.data[DOMAIN]["entries"][entry.entry_id]["device_info"]
 
     sensors = [
-        PontosSensor(key, sensor_config, device_info, coordinator)
+        PontosSensor(key, sensor_config, device_info, coordinator, parsers[key])
         for key, sensor_config in SENSOR_DETAILS.items()
     ]
+    sensors += [
+        PontosCoordinatorSensor(key, sensor_config, device_info, coordinator)
+        for key, sensor_config in COORDINATOR_SENSORS.items()
+    ]
     async_add_entities(sensors)
 
 
 class PontosSensor(CoordinatorEntity, SensorEntity):
-    def __init__(self, key, sensor_config, device_info, coordinator):
-        super().__init__(coordinator)
+    def __init__(self, key, sensor_config, device_info, coordinator, parser):
+        # Only get notified when one of the data keys this sensor reads changes
+        context = frozenset(
+            [sensor_config["endpoint"], *sensor_config.get("attributes", {}).values()]
+        )
+        super().__init__(coordinator, context)
         self._key = key
         self._endpoint = sensor_config["endpoint"]
         self._attr_translation_key = key
@@ -33,9 +81,9 @@ class PontosSensor(CoordinatorEntity, SensorEntity):
         self._attr_device_class = sensor_config.get("device_class", None)
         self._attr_entity_category = sensor_config.get("entity_category", None)
         self._attr_state_class = sensor_config.get("state_class", None)
-        self._format_dict = sensor_config.get("format_dict", None)
-        self._code_dict = sensor_config.get("code_dict", None)
-        self._scale = sensor_config.get("scale", None)
+        self._parser = parser
+        self._parsed_data = None
+        self._parsed_value = None
         self._attributes = sensor_config.get("attributes", {})
         self._attr_unique_id = slugify(
             f"{device_info['serial_number']}_{sensor_config['name']}"
@@ -54,13 +102,11 @@ class PontosSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def native_value(self):
-        data = self.coordinator.data or {}
-        return self.parse_data(data)
+        return self.parse_data()
 
     @property
     def available(self):
-        data = self.coordinator.data or {}
-        return self.parse_data(data) is not None
+        return self.parse_data() is not None
 
     @property
     def extra_state_attributes(self):
@@ -73,48 +119,57 @@ class PontosSensor(CoordinatorEntity, SensorEntity):
             attributes["raw_value"] = raw_value
 
         # Add explicitly defined attributes
-        if self._attributes:
-            attributes.update(
-                {
-                    attr_name: data.get(endpoint)
-                    for attr_name, endpoint in self._attributes.items()
-                    if data.get(endpoint) is not None
-                }
-            )
+        for attr_name, endpoint in self._attributes.items():
+            value = data.get(endpoint)
+            if value is not None:
+                attributes[attr_name] = value
 
         return attributes if attributes else None
 
-    # Parsing and updating sensor data
-    def parse_data(self, data):
-        """Process, format, and validate sensor data."""
-        _data = data.get(self._endpoint, None)
+    def parse_data(self):
+        """Return the parsed sensor value, parsing once per coordinator data update."""
+        data = self.coordinator.data
+        if data is not self._parsed_data:
+            self._parsed_value = self._parser(data or {})
+            self._parsed_data = data
+        return self._parsed_value
 
-        # If data is None, set to None and return
-        if _data is None:
-            return None
 
-        # Convert to string for more consistent manipulation later
-        _data = str(_data)
+class PontosCoordinatorSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor exposing an attribute of the coordinator itself.
 
-        # If the device returns some known error string (e.g., "ERROR: ADM"), mark sensor unavailable
-        if "ERROR" in _data.upper():
-            return None
+    Sensors of the rate limiter's state ("limiter") also update as soon as
+    the request queue changes, not only after a poll, when it has drained.
+    """
 
-        # Apply format replacements if format_dict is present
-        if self._format_dict is not None and _data is not None:
-            for old, new in self._format_dict.items():
-                _data = _data.replace(old, new)
+    def __init__(self, key, sensor_config, device_info, coordinator):
+        super().__init__(coordinator)
+        self._attribute = sensor_config["attribute"]
+        self._limiter = sensor_config.get("limiter", False)
+        self._attr_translation_key = key
+        self._attr_has_entity_name = True
+        self._attr_native_unit_of_measurement = sensor_config.get("unit", None)
+        self._attr_device_class = sensor_config.get("device_class", None)
+        self._attr_state_class = sensor_config.get("state_class", None)
+        self._attr_entity_category = sensor_config.get("entity_category", None)
+        self._attr_unique_id = slugify(
+            f"{device_info['serial_number']}_{sensor_config['name']}"
+        )
+        self._device_info = device_info
 
-        # Translate alarm codes if code_dict is present
-        if self._code_dict is not None and _data is not None:
-            _data = self._code_dict.get(_data.upper(), _data)
+    @property
+    def device_info(self):
+        return {
+            "identifiers": self._device_info["identifiers"],
+        }
 
-        # Scale sensor data if scale is present
-        if self._scale is not None and _data is not None:
-            try:
-                _data = round(float(_data) * self._scale, 2)
-            except (ValueError, TypeError):
-                pass
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        if self._limiter:
+            self.async_on_remove(
+                self.coordinator.async_add_limiter_listener(self.async_write_ha_state)
+            )
 
-        # Update sensor data
-        return _data
+    @property
+    def native_value(self):
+        return getattr(self.coordinator, self._attribute)
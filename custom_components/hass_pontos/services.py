@@ -1,13 +1,44 @@
+import asyncio
 import logging
-from .utils import fetch_data
+from functools import partial
 
-from .const import DOMAIN, MAKES, CONF_MAKE, CONF_IP_ADDRESS
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.const import (
+    ATTR_AREA_ID,
+    ATTR_DEVICE_ID,
+    ATTR_ENTITY_ID,
+    ENTITY_MATCH_ALL,
+)
+from homeassistant.helpers.device_registry import async_get as async_get_device_registry
+from homeassistant.helpers.entity_registry import async_get as async_get_entity_registry
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
+
+from .utils import fetch_endpoints
+from .limiter import PRIORITIES, PRIORITY_COMMAND
+
+from .const import DOMAIN, MAKES, CONF_MAKE
 
 LOGGER = logging.getLogger(__name__)
 
+# Service call keys that limit a call to some devices
+TARGET_KEYS = ("entry_id", ATTR_DEVICE_ID, ATTR_AREA_ID, ATTR_ENTITY_ID)
+
 
-async def async_send_command(hass, ip_address, base_url, endpoint, data=None):
-    """Helper function to send commands to the device."""
+async def async_send_command(
+    hass,
+    ip_address,
+    base_url,
+    endpoint,
+    data=None,
+    session=None,
+    priority=PRIORITY_COMMAND,
+):
+    """Send a command to the device once, returning its reply or None if none came.
+
+    Commands are not retried: the device may have acted on a request whose
+    reply got lost, and repeating it could e.g. toggle a setting twice.
+    """
     # Format the endpoint with dynamic data if provided
     if data:
         endpoint = endpoint.format(**data)
@@ -15,49 +46,161 @@ async def async_send_command(hass, ip_address, base_url, endpoint, data=None):
     # Construct the full URL from the device-specific base URL
     url = base_url.format(ip=ip_address) + endpoint
 
-    # Use fetch_data for retries
-    result = await fetch_data(hass, ip_address, url, max_attempts=4, retry_delay=1)
+    responses = await fetch_endpoints(
+        hass, ip_address, url, session=session, priority=priority
+    )
+    result = responses.get(url)
 
     # Log the response
-    if result:
+    if result is not None:
         LOGGER.debug(f"Command sent successfully to {url}: {result}")
     else:
         LOGGER.error(f"Failed to send command to {url}")
 
+    return result
 
-async def async_service_handler(hass, call, service_name):
-    """General service handler to handle different services."""
 
-    for entry_id, entry_data in hass.data[DOMAIN].get("entries", {}).items():
-        config_entry = entry_data["entry"]
-        coordinator = entry_data["coordinator"]
-        lock = entry_data["command_lock"]
+async def async_send_service_command(hass, coordinator, base_url, service, data=None):
+    """Send a service command and return the data keys its response reports.
 
-        if not config_entry or not lock:
-            continue
+    The device's address and session are read from the coordinator when the
+    command is sent, not when it was queued, so option changes apply to it.
 
-        if lock.locked():
-            LOGGER.warning(
-                f"Service '{service_name}' skipped: previous command still running"
-            )
-            continue
+    The service's "response" declaration maps keys of the device's reply to
+    coordinator data keys, e.g. {"setPRF": "getPRF"}. Its "priority" ("safety"
+    or "command", the default) decides which requests it may overtake.
+
+    Raises HomeAssistantError if the device did not answer.
+    """
+    ip_address = coordinator.ip_address
+    result = await async_send_command(
+        hass,
+        ip_address,
+        base_url,
+        service["endpoint"],
+        data,
+        coordinator.session,
+        _priority(service),
+    )
+    if result is None:
+        raise HomeAssistantError(
+            f"Device at {ip_address} did not answer {service['endpoint']}"
+        )
+
+    return {
+        data_key: result[response_key]
+        for response_key, data_key in service.get("response", {}).items()
+        if response_key in result
+    }
+
+
+def _priority(service):
+    """Return the limiter priority of a service."""
+    return PRIORITIES.get(service.get("priority", "command"), PRIORITY_COMMAND)
 
-        async with lock:
-            ip_address = config_entry.options.get(CONF_IP_ADDRESS)
-            make = config_entry.data.get(CONF_MAKE)
-            device_const = MAKES[make]
 
-            # Grab the device-specific BASE_URL
-            base_url = device_const.BASE_URL
+def _confirm_keys(service):
+    """Return the data keys to read back after a service, or None for everything."""
+    if "response" not in service and "confirm" not in service:
+        return None
+    return [*service.get("response", {}).values(), *service.get("confirm", [])]
 
-            # Extract the endpoint for the requested service
-            endpoint = device_const.SERVICES[service_name]["endpoint"]
 
-            # Send the command with dynamic data (if any)
-            await async_send_command(hass, ip_address, base_url, endpoint, call.data)
+def _target_entry_ids(hass, call):
+    """Return the config entries a service call targets, or every entry if untargeted.
 
-            # Trigger a data refresh after the command
-            await coordinator.async_refresh()
+    Devices, areas and entities are resolved to the entries they belong to. A
+    call that targets something matching none of our devices targets nothing.
+    """
+    entries = hass.data[DOMAIN].get("entries", {})
+    if not any(key in call.data for key in TARGET_KEYS):
+        return list(entries)
+    if call.data.get(ATTR_ENTITY_ID) == ENTITY_MATCH_ALL:
+        return list(entries)
+
+    targets = set(cv.ensure_list(call.data.get("entry_id")))
+    selected = async_extract_referenced_entity_ids(hass, call)
+
+    device_registry = async_get_device_registry(hass)
+    for device_id in selected.referenced_devices:
+        device = device_registry.async_get(device_id)
+        if device:
+            targets.update(device.config_entries)
+
+    entity_registry = async_get_entity_registry(hass)
+    for entity_id in selected.referenced | selected.indirectly_referenced:
+        entity = entity_registry.async_get(entity_id)
+        if entity and entity.config_entry_id:
+            targets.add(entity.config_entry_id)
+
+    return [entry_id for entry_id in targets if entry_id in entries]
+
+
+async def async_service_handler(hass, call, service_name):
+    """General service handler, dispatching to the targeted devices concurrently."""
+    entries = hass.data[DOMAIN].get("entries", {})
+    entry_ids = _target_entry_ids(hass, call)
+
+    if not entry_ids:
+        if any(key in call.data for key in TARGET_KEYS):
+            # Never fall back to every device, e.g. when closing the valves
+            raise HomeAssistantError(
+                f"Service '{service_name}' targets none of the configured devices"
+            )
+        LOGGER.warning(f"Service '{service_name}' called without a matching device")
+        return
+
+    await asyncio.gather(
+        *(
+            async_entry_service_handler(hass, call, service_name, entries[entry_id])
+            for entry_id in entry_ids
+        )
+    )
+
+
+async def async_entry_service_handler(hass, call, service_name, entry_data):
+    """Queue a service command for a single device and wait until it is sent."""
+    config_entry = entry_data["entry"]
+    queue = entry_data["command_queue"]
+
+    if not config_entry or not queue:
+        return
+
+    make = config_entry.data.get(CONF_MAKE)
+    device_const = MAKES[make]
+
+    # Not every make supports every registered service
+    if service_name not in device_const.SERVICES:
+        return
+
+    # Grab the device-specific BASE_URL
+    base_url = device_const.BASE_URL
+
+    # Extract the endpoint for the requested service
+    service = device_const.SERVICES[service_name]
+    endpoint = service["endpoint"]
+
+    # Ordered commands (valve) are never coalesced; others supersede queued
+    # commands for the same device setting, e.g. "set/prf" or "set/buz"
+    coalesce_key = None
+    if not service.get("ordered", False):
+        formatted = endpoint.format(**call.data) if call.data else endpoint
+        coalesce_key = "/".join(formatted.split("/")[:2])
+
+    # Send the command with dynamic data (if any); the queue reads back afterwards
+    await queue.async_submit(
+        partial(
+            async_send_service_command,
+            hass,
+            entry_data["coordinator"],
+            base_url,
+            service,
+            call.data,
+        ),
+        coalesce_key,
+        _confirm_keys(service),
+        _priority(service),
+    )
 
 
 async def register_services(hass):
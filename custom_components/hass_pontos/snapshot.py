@@ -0,0 +1,111 @@
+from collections.abc import Mapping
+from functools import lru_cache
+
+from .entity import resolve_sensor
+
+# Marks a key the device did not report, so that None stays a valid value
+_MISSING = object()
+
+
+@lru_cache(maxsize=None)
+def get_data_index(device_const, extra_keys=()):
+    """Return data key -> position for every data key a make reads, built once per make.
+
+    Covers the sensors (endpoints and attributes), the sensors behind the
+    selectors, switches, time entries and buttons, the keys services report
+    or confirm, and `extra_keys` read by the coordinator itself.
+    """
+    keys = set(extra_keys)
+    for sensor_config in device_const.SENSOR_DETAILS.values():
+        keys.add(sensor_config["endpoint"])
+        keys.update(sensor_config.get("attributes", {}).values())
+
+    references = []
+    for name in ("SELECTORS", "SWITCHES", "TIME_ENTRIES"):
+        for entity_config in getattr(device_const, name, {}).values():
+            references.append(entity_config.get("sensor"))
+    for button_config in getattr(device_const, "BUTTONS", {}).values():
+        references.append(button_config.get("availability_sensor"))
+    for reference in references:
+        key = reference and resolve_sensor(device_const, reference)
+        if key:
+            keys.add(device_const.SENSOR_DETAILS[key]["endpoint"])
+
+    for service in device_const.SERVICES.values():
+        keys.update(service.get("response", {}).values())
+        keys.update(service.get("confirm", []))
+
+    return {key: position for position, key in enumerate(sorted(keys))}
+
+
+def project(payload, index):
+    """Return only the keys of a decoded payload that are in `index`."""
+    return {key: value for key, value in payload.items() if key in index}
+
+
+class DeviceData(Mapping):
+    """Read-only snapshot of the data keys a make reads, holding the values in one tuple.
+
+    Keys outside the make's index are dropped. Snapshots built from the same
+    index compare and diff position by position.
+    """
+
+    __slots__ = ("_index", "_values", "_size")
+
+    def __init__(self, index, data):
+        self._index = index
+        self._values = tuple(data.get(key, _MISSING) for key in index)
+        self._size = len(self._values) - self._values.count(_MISSING)
+
+    def __getitem__(self, key):
+        position = self._index.get(key)
+        if position is not None:
+            value = self._values[position]
+            if value is not _MISSING:
+                return value
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        position = self._index.get(key)
+        if position is None:
+            return default
+        value = self._values[position]
+        return default if value is _MISSING else value
+
+    def __contains__(self, key):
+        position = self._index.get(key)
+        return position is not None and self._values[position] is not _MISSING
+
+    def __iter__(self):
+        return (
+            key
+            for key, value in zip(self._index, self._values)
+            if value is not _MISSING
+        )
+
+    def __len__(self):
+        return self._size
+
+    def __eq__(self, other):
+        if isinstance(other, DeviceData) and other._index is self._index:
+            return self._values == other._values
+        return super().__eq__(other)
+
+    __hash__ = None
+
+    def changed_keys(self, other):
+        """Return the keys whose value differs from the Mapping `other`."""
+        if isinstance(other, DeviceData) and other._index is self._index:
+            return {
+                key
+                for key, value, previous in zip(
+                    self._index, self._values, other._values
+                )
+                if value != previous
+            }
+        return {
+            key for key in self.keys() | other.keys() if self.get(key) != other.get(key)
+        }
+
+    def __repr__(self):
+        return f"DeviceData({dict(self)!r})"
@@ -3,12 +3,9 @@ from datetime import datetime, time as dtime
 
 from homeassistant.components.time import TimeEntity
 from homeassistant.util import slugify
-from homeassistant.core import callback
-from homeassistant.helpers.event import async_track_state_change_event
-from homeassistant.helpers import entity_registry as er
-from homeassistant.const import STATE_UNAVAILABLE
 
-from .const import DOMAIN, CONF_MAKE, CONF_IP_ADDRESS, MAKES
+from .const import DOMAIN, CONF_MAKE, MAKES
+from .entity import PontosEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,22 +16,25 @@ async def async_setup_entry(hass, entry, async_add_entities):
     device_const = MAKES[make]
     TIME_ENTRIES = device_const.TIME_ENTRIES
 
+    coordinator = hass.data[DOMAIN]["entries"][entry.entry_id]["coordinator"]
     device_info = hass.data[DOMAIN]["entries"][entry.entry_id]["device_info"]
     entities = []
 
     for key, config in TIME_ENTRIES.items():
-        entities.append(PontosTimeEntry(hass, entry, device_info, key, config))
+        entities.append(
+            PontosTimeEntry(coordinator, entry, device_info, device_const, key, config)
+        )
 
-    async_add_entities(entities, True)
+    async_add_entities(entities)
 
 
-class PontosTimeEntry(TimeEntity):
+class PontosTimeEntry(PontosEntity, TimeEntity):
     """Represents a device time value that mirrors a sensor and calls a service on change."""
 
-    def __init__(self, hass, entry, device_info, key, config):
-        self._hass = hass
+    def __init__(self, coordinator, entry, device_info, device_const, key, config):
+        sensors = [config["sensor"]] if config.get("sensor") else []
+        super().__init__(coordinator, device_info, device_const, sensors)
         self._entry = entry
-        self._device_info = device_info
         self._key = key
         self._config = config
         self._sensor = config.get("sensor")
@@ -44,52 +44,16 @@ class PontosTimeEntry(TimeEntity):
         self._attr_entity_category = config.get("entity_category", None)
         self._attr_unique_id = slugify(f"{device_info['serial_number']}_{key}_time")
         self._attr_native_value = None
-        self._available = True
-        self._sensor_unique_id = (
-            slugify(f"{device_info['serial_number']}_{self._sensor}")
-            if self._sensor
-            else None
-        )
-        self._sensor_entity_id = None
+        self._available = False
 
-    async def async_added_to_hass(self):
-        registry = er.async_get(self._hass)
-        if not self._sensor_unique_id:
+        if not self._sensor:
             _LOGGER.warning("No sensor configured for time entry %s", self._key)
-            self._available = False
-            self.async_write_ha_state()
-            return
-
-        self._sensor_entity_id = registry.async_get_entity_id(
-            "sensor", DOMAIN, self._sensor_unique_id
-        )
 
-        if self._sensor_entity_id:
-            state = self._hass.states.get(self._sensor_entity_id)
-            if state:
-                self._available = state.state != STATE_UNAVAILABLE
-                if self._available:
-                    self._update_current_time(state.state)
-
-            async_track_state_change_event(
-                self._hass, self._sensor_entity_id, self._sensor_state_changed
-            )
-        else:
-            _LOGGER.warning(
-                f"Sensor for %s not found: %s", self._key, self._sensor_unique_id
-            )
-            self._available = False
-
-        self.async_write_ha_state()
-
-    @callback
-    def _sensor_state_changed(self, event):
-        new_state = event.data.get("new_state")
-        if new_state is not None:
-            self._available = new_state.state != STATE_UNAVAILABLE
-            if self._available:
-                self._update_current_time(new_state.state)
-            self.async_write_ha_state()
+    def _update_from_data(self):
+        value = self.sensor_value(self._sensor)
+        self._available = value is not None
+        if self._available:
+            self._update_current_time(value)
 
     def _update_current_time(self, state_value):
         """Parse sensor state into a time object and update native value."""
@@ -133,7 +97,6 @@ class PontosTimeEntry(TimeEntity):
             if parsed != self._attr_native_value:
                 _LOGGER.debug("%s updated to %s", self._key, parsed.isoformat())
                 self._attr_native_value = parsed
-                self.async_write_ha_state()
         else:
             _LOGGER.warning(
                 "%s state value '%s' could not be parsed as time", self._key, value
@@ -161,11 +124,11 @@ class PontosTimeEntry(TimeEntity):
                     return
 
         _LOGGER.info("Time set for %s → %s", self._key, time_str)
-        await self._hass.services.async_call(
+        await self.hass.services.async_call(
             DOMAIN,
             self._service,
             {
-                "ip_address": self._entry.options[CONF_IP_ADDRESS],
+                "entry_id": self._entry.entry_id,
                 "data": time_str,
             },
         )
@@ -177,12 +140,6 @@ class PontosTimeEntry(TimeEntity):
     def unique_id(self):
         return self._attr_unique_id
 
-    @property
-    def device_info(self):
-        return {
-            "identifiers": self._device_info["identifiers"],
-        }
-
     @property
     def available(self):
         return self._available
@@ -1,60 +1,257 @@
 import logging
 import asyncio
-from aiohttp import ClientConnectorError
+import hashlib
+import json
+from aiohttp import ClientError, ClientSession, TCPConnector
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+from .capture import get_capture
+from .limiter import get_limiter, PRIORITY_POLL
+from .snapshot import project
+
 LOGGER = logging.getLogger(__name__)
 
+# Idle connections of a dedicated device session are kept open this long
+DEVICE_KEEPALIVE_TIMEOUT = 30
+DNS_CACHE_TTL = 300
 
-# Fetching data with error handling and URL logging
-async def fetch_data(hass, ip, url_list, max_attempts=1, retry_delay=10):
-    """Fetch data from the Pontos device using the shared aiohttp session (with simple retry logic)."""
+# Returned by fetch_endpoints instead of a payload whose body did not change
+UNCHANGED = object()
+
+
+def create_device_session():
+    """Create an aiohttp session for a single device.
+
+    Sends one request at a time over a single kept-alive connection, for
+    devices whose web server handles concurrent connections badly.
+    """
+    connector = TCPConnector(
+        limit_per_host=1,
+        keepalive_timeout=DEVICE_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        enable_cleanup_closed=True,
+    )
+    return ClientSession(connector=connector)
+
+
+def _digest(body):
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+async def _request(session, url, digest=None, keys=None, capture=None):
+    """Request a single URL, returning (payload, digest of the body).
+
+    The payload is None on failure, and UNCHANGED without decoding the body
+    if its digest matches `digest`. With `keys`, the payload only keeps those.
+    With a `capture`, the raw response or failure is recorded.
+    """
+    started = capture.started() if capture is not None else None
+    try:
+        # Use async with only on the request, not the session
+        async with session.get(url, timeout=5) as response:
+            if capture is not None:
+                # Recorded before decoding, so bodies that fail to decode are kept too
+                capture.record(url, started, response.status, await response.read())
+            if response.status == 200:
+                body = await response.read()
+                body_digest = _digest(body)
+                if body_digest == digest:
+                    return UNCHANGED, digest
+                # Decode as JSON even if the Content-Type header is missing.
+                payload = json.loads(body)
+                if keys is not None and isinstance(payload, dict):
+                    payload = project(payload, keys)
+                return payload, body_digest
+
+            LOGGER.error(f"HTTP response error (status {response.status}): {url}")
+    except (ClientError, asyncio.TimeoutError, ValueError) as e:
+        LOGGER.error(f"HTTP request exeption for {url}: {e}")
+        if capture is not None and not isinstance(e, ValueError):
+            capture.record(url, started, error=type(e).__name__)
+
+    return None, None
+
+
+async def _fetch_url(
+    session,
+    url,
+    limiter=None,
+    priority=PRIORITY_POLL,
+    digest=None,
+    keys=None,
+    capture=None,
+):
+    """Fetch a single URL through the limiter, returning (payload, digest) like _request.
+
+    A request preempted by a higher priority one counts as failed.
+    """
+    if limiter is None:
+        return await _request(session, url, digest, keys, capture)
+
+    await limiter.acquire(priority)
+
+    # Run the request as its own task, so the limiter can cancel just the request
+    request = asyncio.ensure_future(_request(session, url, digest, keys, capture))
+    limiter.track(request, priority)
+    try:
+        return await request
+    except asyncio.CancelledError:
+        if not limiter.preempted(request):
+            raise
+        LOGGER.warning(f"Request preempted by a higher priority request: {url}")
+        return None, None
+    finally:
+        limiter.untrack(request)
+
+
+async def fetch_endpoints(
+    hass,
+    ip,
+    url_list,
+    max_attempts=1,
+    retry_delay=10,
+    preamble=None,
+    session=None,
+    priority=PRIORITY_POLL,
+    digests=None,
+    keys=None,
+):
+    """Fetch each URL from the device, retrying only the URLs that failed.
+
+    URLs that are also listed in `preamble` (e.g. the admin unlock) are requested
+    one after another in list order. The remaining URLs are then requested
+    concurrently, but only once every preamble URL answered; otherwise they
+    wait for the next attempt. Returns a dict mapping each URL template in
+    `url_list` that answered to its decoded payload; URLs that still fail are
+    left out.
+
+    Every request waits for the rate limiter of the device at `ip`, with the
+    given `priority`, or with priority[url] if `priority` is a dict.
+
+    `digests` maps URL templates to the digest of their last response body and
+    is updated in place. A URL whose body matches its digest is not decoded;
+    it maps to UNCHANGED instead of a payload.
+
+    With `keys` (a collection of data keys), each payload is cut down to those
+    keys right after decoding, so the rest of the body is never kept.
+
+    While traffic of the device at `ip` is captured (see capture.py), every
+    raw response is recorded.
+    """
     if isinstance(url_list, str):
         # Convert to a one-element list
         url_list = [url_list]
 
-    urls = [url.format(ip=ip) for url in url_list]
+    preamble = preamble or []
 
     # Get the shared aiohttp session from Home Assistant
-    session = async_get_clientsession(hass)
+    if session is None:
+        session = async_get_clientsession(hass)
+
+    # Polls, commands and config flow probes share the device's limiter
+    limiter = get_limiter(hass, ip) if hass is not None else None
+    capture = get_capture(hass, ip) if hass is not None else None
+    if isinstance(priority, dict):
+        priorities = priority
+    else:
+        priorities = dict.fromkeys(url_list, priority)
+
+    def fetch(url):
+        return _fetch_url(
+            session,
+            url.format(ip=ip),
+            limiter,
+            priorities.get(url, PRIORITY_POLL),
+            digests.get(url) if digests is not None else None,
+            keys,
+            capture,
+        )
+
+    def store(url, result):
+        responses[url], digest = result
+        if digests is not None and digest is not None:
+            digests[url] = digest
 
-    # Loop over attempts for a simple retry mechanism
+    responses = {}
+    pending = list(url_list)
+
+    # Loop over attempts, each one only re-requesting what is still missing
     for attempt in range(1, max_attempts + 1):
-        data = {}
-        failed = False
-
-        # Iterate over each URL and fetch data
-        for url in urls:
-            try:
-                # Use async with only on the request, not the session
-                async with session.get(url, timeout=5) as response:
-                    if response.status == 200:
-                        # Allow decoding JSON even if the Content-Type header is missing.
-                        data.update(
-                            await response.json(content_type=None)
-                        )  # Update data with response
-                    else:
-                        LOGGER.error(
-                            f"HTTP response error (status {response.status}): {url}"
-                        )
-                        failed = True
-            except (ClientConnectorError, asyncio.TimeoutError) as e:
-                LOGGER.error(f"HTTP request exeption for {url}: {e}")
-                failed = True
+        ordered = [url for url in pending if url in preamble]
+        concurrent = [url for url in pending if url not in preamble]
+
+        # Preamble URLs must complete, in order, before any other request is sent
+        for url in ordered:
+            store(url, await fetch(url))
+            if responses[url] is None:
+                # Without e.g. the admin unlock the other requests would fail too
+                break
+
+        unlocked = all(responses.get(url) is not None for url in ordered)
+
+        # The remaining URLs are independent reads and can run at the same time
+        if concurrent and unlocked:
+            results = await asyncio.gather(*(fetch(url) for url in concurrent))
+            for url, result in zip(concurrent, results):
+                store(url, result)
+
+        pending = [url for url in pending if responses.get(url) is None]
 
         # If no failures, break out of the retry loop
-        if not failed:
+        if not pending:
             break
 
         # If there were failures, wait before retrying (unless it's the last attempt)
         if attempt < max_attempts:
             LOGGER.warning(
-                f"Attempt {attempt}/{max_attempts} failed. Retrying in {retry_delay * attempt} seconds..."
+                f"Attempt {attempt}/{max_attempts}: {len(pending)} of {len(url_list)} URLs failed. Retrying in {retry_delay * attempt} seconds..."
             )
             await asyncio.sleep(retry_delay * attempt)
         else:
             LOGGER.error(
-                f"Attempt {attempt}/{max_attempts} failed. No response from device."
+                f"Attempt {attempt}/{max_attempts} failed. No response from device for: {', '.join(url.format(ip=ip) for url in pending)}"
             )
 
-    return data if not failed else {}
+    return {url: payload for url, payload in responses.items() if payload is not None}
+
+
+# Fetching data with error handling and URL logging
+async def fetch_data(
+    hass,
+    ip,
+    url_list,
+    max_attempts=1,
+    retry_delay=10,
+    preamble=None,
+    session=None,
+    partial=False,
+    priority=PRIORITY_POLL,
+):
+    """Fetch data from the Pontos device using the shared aiohttp session (with simple retry logic).
+
+    Responses are merged in `url_list` order. Unless `partial` is set, an empty
+    dict is returned when any URL is still failing after the last attempt.
+    """
+    if isinstance(url_list, str):
+        # Convert to a one-element list
+        url_list = [url_list]
+
+    responses = await fetch_endpoints(
+        hass,
+        ip,
+        url_list,
+        max_attempts=max_attempts,
+        retry_delay=retry_delay,
+        preamble=preamble,
+        session=session,
+        priority=priority,
+    )
+
+    if len(responses) < len(url_list) and not partial:
+        return {}
+
+    # Merge in list order so later URLs override earlier ones
+    data = {}
+    for url in url_list:
+        data.update(responses.get(url, {}))
+    return data
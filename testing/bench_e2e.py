@@ -0,0 +1,346 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from bench_parse import MAKE_FIXTURES
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Make the integration importable when running from the testing folder
+sys.path.insert(0, ROOT)
+
+from homeassistant import loader  # noqa: E402
+from homeassistant.bootstrap import async_load_base_functionality  # noqa: E402
+from homeassistant.config_entries import (  # noqa: E402
+    ConfigEntries,
+    ConfigEntry,
+    ConfigEntryState,
+)
+from homeassistant.const import __version__ as HA_VERSION  # noqa: E402
+from homeassistant.core import EVENT_STATE_CHANGED, HomeAssistant  # noqa: E402
+from homeassistant.setup import async_setup_component  # noqa: E402
+
+from custom_components.hass_pontos.const import (  # noqa: E402
+    CONF_DEVICE_NAME,
+    CONF_FETCH_INTERVAL,
+    CONF_IP_ADDRESS,
+    CONF_MAKE,
+    DOMAIN,
+    MAKES,
+)
+from custom_components.hass_pontos.config_flow import (  # noqa: E402
+    PontosConfigFlow,
+)
+
+# How often the event loop lag probe wakes up
+PROBE_INTERVAL = 0.005
+
+# Simulator device type serving each make, from the fixture it is based on
+MAKE_DEVICES = {
+    make: filename.removesuffix(".json") for make, filename in MAKE_FIXTURES.items()
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Set up the integration in Home Assistant against fleet.py and measure "
+            "polling, for every make and fleet size. Prints JSON results."
+        )
+    )
+    parser.add_argument(
+        "--makes",
+        nargs="+",
+        choices=MAKE_DEVICES.keys(),
+        default=list(MAKE_DEVICES),
+        help="Makes to benchmark.",
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=[1, 10, 100],
+        help="Numbers of devices per run.",
+    )
+    parser.add_argument(
+        "--interval", type=int, default=2, help="Fetch interval in seconds."
+    )
+    parser.add_argument(
+        "--polls",
+        type=int,
+        default=10,
+        help="Fetch intervals to measure per run, after setup.",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.05,
+        help="Median delay in seconds of every simulated response.",
+    )
+    parser.add_argument(
+        "--dynamics",
+        default="household",
+        help="fleet.py scenario, so that the data changes between polls.",
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=60.0,
+        help="Simulated seconds per real second for --dynamics.",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Seed for the simulated devices."
+    )
+    parser.add_argument(
+        "--output", default=None, help="Write the JSON results to this file."
+    )
+    return parser.parse_args()
+
+
+def start_fleet(args, device_key, devices):
+    """Run fleet.py in its own process, so its CPU time is not measured."""
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-u",
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), "fleet.py"),
+            "--devices",
+            str(devices),
+            "--makes",
+            device_key,
+            "--latency",
+            str(args.latency),
+            "--latency-dist",
+            "lognormal",
+            "--serialize",
+            "--dynamics",
+            args.dynamics,
+            "--speed",
+            str(args.speed),
+            "--seed",
+            str(args.seed),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    addresses = []
+    for line in process.stdout:
+        if line.startswith("Serving"):
+            return process, addresses
+        addresses.append(line.split()[0])
+    raise RuntimeError("fleet.py exited before serving")
+
+
+async def start_hass(config_dir):
+    """Start a bare Home Assistant that loads custom integrations from config_dir."""
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    await async_load_base_functionality(hass)
+    await hass.async_start()
+    return hass
+
+
+def percentiles(values, scale=1000):
+    """Summarize values in seconds as milliseconds."""
+    if not values:
+        return None
+    values = sorted(values)
+
+    def pick(fraction):
+        return round(
+            values[min(len(values) - 1, int(len(values) * fraction))] * scale, 2
+        )
+
+    return {
+        "mean": round(statistics.mean(values) * scale, 2),
+        "p50": pick(0.5),
+        "p90": pick(0.9),
+        "p99": pick(0.99),
+        "max": round(values[-1] * scale, 2),
+    }
+
+
+async def probe_loop(lags, stop):
+    """Record how late the event loop wakes up a short sleep."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(loop.time() - start - PROBE_INTERVAL)
+
+
+async def measure_cpu(duration, lags=None):
+    """Return the CPU seconds per second used while the lag probe runs for `duration`."""
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_loop([] if lags is None else lags, stop))
+    start = time.process_time()
+    await asyncio.sleep(duration)
+    cpu = time.process_time() - start
+    stop.set()
+    await probe
+    return cpu / duration
+
+
+def time_polls(coordinator, durations):
+    """Record the duration of every refresh of a coordinator."""
+    update_data = coordinator._async_update_data
+
+    async def timed_update_data():
+        start = time.perf_counter()
+        try:
+            return await update_data()
+        finally:
+            durations.append(time.perf_counter() - start)
+
+    coordinator._async_update_data = timed_update_data
+
+
+async def run(args, make, addresses, config_dir):
+    """Set up one entry per address, then measure polling for args.polls intervals."""
+    hass = await start_hass(config_dir)
+
+    # The integration and its platforms are loaded up front, so memory is per device
+    for domain in [DOMAIN, *MAKES[make].PLATFORMS]:
+        await async_setup_component(hass, domain, {})
+
+    # CPU used without any device, including the lag probe, is subtracted later
+    idle_cpu = await measure_cpu(args.interval)
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    setup_start = time.perf_counter()
+    entries = [
+        ConfigEntry(
+            version=PontosConfigFlow.VERSION,
+            minor_version=1,
+            domain=DOMAIN,
+            title=f"Device {index}",
+            data={CONF_DEVICE_NAME: f"Device {index}", CONF_MAKE: make},
+            source="user",
+            options={CONF_IP_ADDRESS: address, CONF_FETCH_INTERVAL: args.interval},
+        )
+        for index, address in enumerate(addresses)
+    ]
+    # Set up concurrently, like Home Assistant does at startup
+    await asyncio.gather(*(hass.config_entries.async_add(entry) for entry in entries))
+    await hass.async_block_till_done()
+    setup = time.perf_counter() - setup_start
+    memory = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    durations = []
+    for entry_data in hass.data[DOMAIN]["entries"].values():
+        time_polls(entry_data["coordinator"], durations)
+
+    writes = 0
+
+    def count_write(_event):
+        nonlocal writes
+        writes += 1
+
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, count_write)
+
+    lags = []
+    cpu = await measure_cpu(args.polls * args.interval, lags) - idle_cpu
+    unsub()
+
+    loaded = sum(
+        entry.state is ConfigEntryState.LOADED
+        for entry in hass.config_entries.async_entries(DOMAIN)
+    )
+    # Unload first, so that no poll is still running when the session closes
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    await hass.async_stop(force=True)
+
+    polls = len(durations)
+    duration = args.polls * args.interval
+    return {
+        "make": make,
+        "devices": len(addresses),
+        "loaded_entries": loaded,
+        "setup_s": round(setup, 3),
+        "polls": polls,
+        "poll_ms": percentiles(durations),
+        "loop_lag_ms": percentiles(lags),
+        "idle_cpu_pct": round(idle_cpu * 100, 2),
+        "cpu_ms_per_poll": round(cpu * duration / polls * 1000, 3) if polls else None,
+        "state_writes_per_poll": round(writes / polls, 2) if polls else None,
+        "memory_kib_per_device": round(memory / len(addresses) / 1024, 1),
+    }
+
+
+def benchmark(args, make, devices):
+    process, addresses = start_fleet(args, MAKE_DEVICES[make], devices)
+    try:
+        with tempfile.TemporaryDirectory() as config_dir:
+            # A fresh config dir per run, so no cached state is reused
+            os.symlink(
+                os.path.join(ROOT, "custom_components"),
+                os.path.join(config_dir, "custom_components"),
+            )
+            return asyncio.run(run(args, make, addresses, config_dir))
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main(args):
+    logging.basicConfig(level=logging.ERROR)
+
+    with open(os.path.join(ROOT, "custom_components", DOMAIN, "manifest.json")) as f:
+        version = json.load(f)["version"]
+
+    results = []
+    for make in args.makes:
+        for devices in args.sizes:
+            result = benchmark(args, make, devices)
+            print(
+                f"{make:<30}{devices:>4} devices: "
+                f"poll p50 {result['poll_ms']['p50']:.1f} ms, "
+                f"lag p99 {result['loop_lag_ms']['p99']:.1f} ms, "
+                f"{result['cpu_ms_per_poll']:.2f} ms CPU/poll, "
+                f"{result['state_writes_per_poll']:.1f} writes/poll, "
+                f"{result['memory_kib_per_device']:.0f} KiB/device",
+                file=sys.stderr,
+            )
+            results.append(result)
+
+    report = {
+        "integration_version": version,
+        "homeassistant_version": HA_VERSION,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "interval_s": args.interval,
+            "polls": args.polls,
+            "latency_s": args.latency,
+            "dynamics": args.dynamics,
+            "speed": args.speed,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,113 @@
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+
+import aiohttp
+from werkzeug.serving import make_server
+
+from serve import create_app, load_device_data
+
+# Make the integration importable when running from the testing folder
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from custom_components.hass_pontos.const import MAKES  # noqa: E402
+from custom_components.hass_pontos.utils import fetch_data  # noqa: E402
+
+# Simulator device -> integration make
+DEVICE_MAKES = {
+    "pontos": "Hansgrohe Pontos",
+    "safetech": "SYR SafeTech+",
+    "safetech_v4": "SYR SafeTech+ (Old firmware)",
+    "neosoft": "SYR NeoSoft",
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compare sequential and concurrent polling against serve.py."
+    )
+    parser.add_argument(
+        "--device",
+        choices=DEVICE_MAKES.keys(),
+        default="pontos",
+        help="Which device to simulate.",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.5,
+        help="Delay in seconds injected into every simulated response.",
+    )
+    parser.add_argument(
+        "--cycles", type=int, default=10, help="Number of poll cycles per mode."
+    )
+    return parser.parse_args()
+
+
+def start_server(device_key, latency, host="127.0.0.1"):
+    """Serve the simulated device on the port the integration URLs expect."""
+    load_device_data(device_key)
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    app = create_app(device_key, latency=latency)
+    server = make_server(host, 5333, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run_cycles(session, device_const, preamble, cycles):
+    """Poll the device `cycles` times and return the duration of each poll."""
+    durations = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        data = await fetch_data(
+            None,
+            "127.0.0.1",
+            device_const.URL_LIST,
+            preamble=preamble,
+            session=session,
+        )
+        durations.append(time.perf_counter() - start)
+        if not data:
+            raise RuntimeError("Simulator returned no data")
+    return durations
+
+
+def report(label, durations):
+    durations = sorted(durations)
+    p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+    print(
+        f"{label:<12} mean {statistics.mean(durations) * 1000:8.1f} ms"
+        f"   p95 {p95 * 1000:8.1f} ms"
+    )
+
+
+async def main(args):
+    device_const = MAKES[DEVICE_MAKES[args.device]]
+    url_list = device_const.URL_LIST
+    preamble = getattr(device_const, "URL_PREAMBLE", [])
+
+    async with aiohttp.ClientSession() as session:
+        # Every URL as preamble reproduces the old one-after-another behaviour
+        sequential = await run_cycles(session, device_const, url_list, args.cycles)
+        concurrent = await run_cycles(session, device_const, preamble, args.cycles)
+
+    print(
+        f"{args.device}: {len(url_list)} URLs, {args.latency * 1000:.0f} ms latency, "
+        f"{args.cycles} cycles"
+    )
+    report("sequential", sequential)
+    report("concurrent", concurrent)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    server = start_server(args.device, args.latency)
+    try:
+        asyncio.run(main(args))
+    finally:
+        server.shutdown()
@@ -0,0 +1,95 @@
+import argparse
+import json
+import os
+import sys
+import tracemalloc
+
+# Make the integration importable when running from the testing folder
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_parse import MAKE_FIXTURES  # noqa: E402
+from custom_components.hass_pontos.const import MAKES  # noqa: E402
+from custom_components.hass_pontos.coordinator import ACTIVITY_KEYS  # noqa: E402
+from custom_components.hass_pontos.snapshot import (  # noqa: E402
+    DeviceData,
+    get_data_index,
+    project,
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compare coordinator data memory with and without key projection."
+    )
+    parser.add_argument(
+        "--devices", type=int, default=100, help="Simulated devices per make."
+    )
+    return parser.parse_args()
+
+
+def load_body(filename):
+    with open(os.path.join(os.path.dirname(__file__), filename), "rb") as f:
+        return f.read()
+
+
+def full_poll(body, previous):
+    """The coordinator data update before key projection: keep the whole payload."""
+    data = dict(previous)
+    data.update(json.loads(body))
+    return data
+
+
+def projected_poll(body, previous, index):
+    """The current coordinator data update: keep only the keys the make reads."""
+    data = dict(previous)
+    data.update(project(json.loads(body), index))
+    return DeviceData(index, data)
+
+
+def resident(build, devices):
+    """Return the bytes still allocated per device after building its data."""
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    kept = [build() for _ in range(devices)]
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del kept
+    return size / devices
+
+
+def per_poll(poll):
+    """Return the peak bytes allocated while one poll is decoded and merged."""
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    poll()
+    peak = tracemalloc.get_traced_memory()[1] - start
+    tracemalloc.stop()
+    return peak
+
+
+def main(args):
+    print(
+        f"{'make':<30}{'keys':>6}{'used':>6}"
+        f"{'full B/dev':>12}{'proj B/dev':>12}"
+        f"{'full peak B':>13}{'proj peak B':>13}"
+    )
+    for make, filename in MAKE_FIXTURES.items():
+        body = load_body(filename)
+        index = get_data_index(MAKES[make], ACTIVITY_KEYS)
+        full = full_poll(body, {})
+        projected = projected_poll(body, {}, index)
+
+        full_size = resident(lambda: full_poll(body, {}), args.devices)
+        projected_size = resident(lambda: projected_poll(body, {}, index), args.devices)
+        full_peak = per_poll(lambda: full_poll(body, full))
+        projected_peak = per_poll(lambda: projected_poll(body, projected, index))
+
+        print(
+            f"{make:<30}{len(full):>6}{len(projected):>6}"
+            f"{full_size:>12.0f}{projected_size:>12.0f}"
+            f"{full_peak:>13}{projected_peak:>13}"
+        )
+
+
+if __name__ == "__main__":
+    main(parse_args())
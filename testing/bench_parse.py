@@ -0,0 +1,99 @@
+import argparse
+import json
+import os
+import sys
+import timeit
+
+# Make the integration importable when running from the testing folder
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from custom_components.hass_pontos.const import MAKES  # noqa: E402
+from custom_components.hass_pontos.parser import compile_parser  # noqa: E402
+
+# Integration make -> simulator fixture with a representative get/all payload
+MAKE_FIXTURES = {
+    "Hansgrohe Pontos": "pontos.json",
+    "SYR Trio": "safetech.json",
+    "SYR SafeTech+": "safetech.json",
+    "SYR SafeTech+ (Old firmware)": "safetech_v4.json",
+    "SYR NeoSoft": "neosoft.json",
+}
+
+# Parses per state write before the cache: native_value and available each
+# parsed the value; extra_state_attributes only read raw values
+PARSES_PER_WRITE = 2
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Micro-benchmark sensor value parsing for every make."
+    )
+    parser.add_argument(
+        "--number", type=int, default=2000, help="Simulated polls per make."
+    )
+    return parser.parse_args()
+
+
+def legacy_parse(sensor_config, data):
+    """The per-read parsing PontosSensor used before parsers were compiled."""
+    _data = data.get(sensor_config["endpoint"], None)
+    if _data is None:
+        return None
+    _data = str(_data)
+    if "ERROR" in _data.upper():
+        return None
+    format_dict = sensor_config.get("format_dict", None)
+    if format_dict is not None:
+        for old, new in format_dict.items():
+            _data = _data.replace(old, new)
+    code_dict = sensor_config.get("code_dict", None)
+    if code_dict is not None:
+        _data = code_dict.get(_data.upper(), _data)
+    scale = sensor_config.get("scale", None)
+    if scale is not None:
+        try:
+            _data = round(float(_data) * scale, 2)
+        except (ValueError, TypeError):
+            pass
+    return _data
+
+
+def load_fixture(filename):
+    with open(os.path.join(os.path.dirname(__file__), filename)) as f:
+        return json.load(f)
+
+
+def main(args):
+    print(f"Legacy: {PARSES_PER_WRITE} parses per state write, compiled: 1")
+    print(
+        f"{'make':<30}{'sensors':>8}{'legacy µs':>12}{'compiled µs':>13}{'speedup':>9}"
+    )
+    for make, filename in MAKE_FIXTURES.items():
+        sensors = MAKES[make].SENSOR_DETAILS
+        data = load_fixture(filename)
+        parsers = [compile_parser(config) for config in sensors.values()]
+
+        # The compiled values must match the legacy implementation exactly
+        for config, parse in zip(sensors.values(), parsers):
+            assert parse(data) == legacy_parse(config, data), config["name"]
+
+        def legacy_poll():
+            for config in sensors.values():
+                for _ in range(PARSES_PER_WRITE):
+                    legacy_parse(config, data)
+
+        def compiled_poll():
+            # Cached per data update, so each value is parsed once per poll
+            for parse in parsers:
+                parse(data)
+
+        legacy = timeit.timeit(legacy_poll, number=args.number) / args.number
+        compiled = timeit.timeit(compiled_poll, number=args.number) / args.number
+        print(
+            f"{make:<30}{len(sensors):>8}{legacy * 1e6:>12.1f}"
+            f"{compiled * 1e6:>13.1f}{legacy / compiled:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,150 @@
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+
+import aiohttp
+
+from bench_fetch import DEVICE_MAKES, start_server
+
+# Make the integration importable when running from the testing folder
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from custom_components.hass_pontos.const import MAKES  # noqa: E402
+from custom_components.hass_pontos.coordinator import POLL_JITTER, _phase  # noqa: E402
+from custom_components.hass_pontos.utils import fetch_data  # noqa: E402
+
+# How often the event loop lag probe wakes up
+PROBE_INTERVAL = 0.005
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compare lockstep and staggered polling of many simulated devices."
+    )
+    parser.add_argument(
+        "--device",
+        choices=DEVICE_MAKES.keys(),
+        default="safetech",
+        help="Which device to simulate.",
+    )
+    parser.add_argument(
+        "--devices", type=int, default=40, help="Number of simulated devices."
+    )
+    parser.add_argument(
+        "--interval", type=float, default=2.0, help="Poll interval in seconds."
+    )
+    parser.add_argument(
+        "--polls", type=int, default=5, help="Number of polls per device and mode."
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.05,
+        help="Delay in seconds injected into every simulated response.",
+    )
+    return parser.parse_args()
+
+
+class Stats:
+    def __init__(self):
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.lags = []
+
+
+async def probe_loop(stats, stop):
+    """Record how late the event loop wakes up a short sleep."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(PROBE_INTERVAL)
+        stats.lags.append(loop.time() - start - PROBE_INTERVAL)
+
+
+async def poll_device(session, device_const, ip, first_delay, delays, stats):
+    """Poll one simulated device, waiting `first_delay` and then each of `delays`."""
+    preamble = getattr(device_const, "URL_PREAMBLE", [])
+    await asyncio.sleep(first_delay)
+    for delay in [0, *delays]:
+        await asyncio.sleep(delay)
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        try:
+            data = await fetch_data(
+                None, ip, device_const.URL_LIST, preamble=preamble, session=session
+            )
+        finally:
+            stats.in_flight -= 1
+        if not data:
+            raise RuntimeError(f"Simulator returned no data for {ip}")
+
+
+async def run_mode(args, device_const, staggered):
+    """Poll every device like its coordinator would, with or without staggering."""
+    stats = Stats()
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_loop(stats, stop))
+
+    pollers = []
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=0)
+    ) as session:
+        for index in range(args.devices):
+            # Every device has its own loopback address, served by the same simulator
+            ip = f"127.0.{index // 250}.{index % 250 + 1}"
+            # Home Assistant adds a fixed random sub-second offset per coordinator
+            first_delay = random.uniform(0.05, 0.5)
+            if staggered:
+                first_delay += args.interval * _phase(f"entry_{index}")
+                delays = [
+                    args.interval * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+                    for _ in range(args.polls - 1)
+                ]
+            else:
+                delays = [args.interval] * (args.polls - 1)
+            pollers.append(
+                poll_device(session, device_const, ip, first_delay, delays, stats)
+            )
+        await asyncio.gather(*pollers)
+
+    stop.set()
+    await probe
+    return stats
+
+
+def report(label, stats):
+    lags = sorted(stats.lags)
+    p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))]
+    print(
+        f"{label:<10} loop lag mean {statistics.mean(lags) * 1000:6.2f} ms"
+        f"   p99 {p99 * 1000:6.2f} ms   max {lags[-1] * 1000:6.2f} ms"
+        f"   peak in-flight polls {stats.peak_in_flight:3d}"
+    )
+
+
+async def main(args):
+    device_const = MAKES[DEVICE_MAKES[args.device]]
+    random.seed(0)
+
+    lockstep = await run_mode(args, device_const, staggered=False)
+    staggered = await run_mode(args, device_const, staggered=True)
+
+    print(
+        f"{args.device}: {args.devices} devices, {args.interval:.1f} s interval, "
+        f"{args.polls} polls each, {args.latency * 1000:.0f} ms latency"
+    )
+    report("lockstep", lockstep)
+    report("staggered", staggered)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    # Listen on every loopback address, one per simulated device
+    server = start_server(args.device, args.latency, host="0.0.0.0")
+    try:
+        asyncio.run(main(args))
+    finally:
+        server.shutdown()
@@ -0,0 +1,72 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Run in a fresh interpreter per measurement so nothing is cached between runs.
+# Home Assistant itself, including the sensor and valve components the device
+# configs import, is loaded first as it would otherwise dominate the numbers.
+SNIPPET = """
+import json, sys, time, tracemalloc
+sys.path.insert(0, {root!r})
+import homeassistant.core, homeassistant.config_entries, homeassistant.exceptions
+import homeassistant.helpers.update_coordinator, homeassistant.helpers.storage
+import homeassistant.helpers.aiohttp_client, homeassistant.helpers.event
+import homeassistant.components.sensor, homeassistant.components.valve
+
+tracemalloc.start()
+start = time.perf_counter()
+import custom_components.hass_pontos
+from custom_components.hass_pontos.const import MAKES
+for make in {makes!r}:
+    MAKES[make]
+elapsed = time.perf_counter() - start
+current, peak = tracemalloc.get_traced_memory()
+print(json.dumps({{"ms": elapsed * 1000, "kib": current / 1024, "peak_kib": peak / 1024}}))
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Measure integration import time and memory with lazy makes."
+    )
+    parser.add_argument(
+        "--runs", type=int, default=5, help="Fresh interpreters per scenario."
+    )
+    return parser.parse_args()
+
+
+def measure(makes, runs):
+    results = []
+    for _ in range(runs):
+        output = subprocess.check_output(
+            [sys.executable, "-c", SNIPPET.format(root=ROOT, makes=makes)],
+            text=True,
+        )
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return {key: min(result[key] for result in results) for key in results[0]}
+
+
+def main(args):
+    sys.path.insert(0, ROOT)
+    from custom_components.hass_pontos.const import MAKES
+
+    scenarios = {
+        "import only": [],
+        "one make": [next(iter(MAKES))],
+        "all makes (eager)": list(MAKES),
+    }
+    print(f"{'scenario':<20}{'time ms':>10}{'memory KiB':>13}{'peak KiB':>11}")
+    for label, makes in scenarios.items():
+        result = measure(makes, args.runs)
+        print(
+            f"{label:<20}{result['ms']:>10.1f}{result['kib']:>13.1f}"
+            f"{result['peak_kib']:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,239 @@
+import random
+import re
+import time
+
+# Valve codes, as reported in getVLV
+VALVE_CLOSED = 10
+VALVE_CLOSING = 11
+VALVE_OPEN = 20
+VALVE_OPENING = 21
+
+# Alarm codes, as reported in getALA
+NO_ALARM = "FF"
+ALARM_LEAKAGE_VOLUME = "A3"
+ALARM_LEAKAGE_TIME = "A4"
+ALARM_MAX_FLOW = "A5"
+
+# Length of one simulation step in seconds
+TICK = 1.0
+
+SCENARIOS = {
+    # Nothing is drawn: only the time since the last pulse keeps counting
+    "idle": {},
+    # Taps, showers and appliances at random, and the odd supply pressure dip
+    "household": {"consumption": True, "pressure_dips": True},
+    # A household with a small leak that never stops, starting after 10 minutes
+    "leak": {"consumption": True, "pressure_dips": True, "leak_at": 600},
+    # A household with a burst pipe after 10 minutes
+    "burst": {"consumption": True, "pressure_dips": True, "burst_at": 600},
+}
+
+
+class SimulationClock:
+    """Simulated seconds since the clock was created, `speed` times real time."""
+
+    def __init__(self, speed=1.0):
+        self.speed = speed
+        self.start = time.monotonic()
+
+    def now(self):
+        return (time.monotonic() - self.start) * self.speed
+
+
+class DeviceDynamics:
+    """Seeded simulation of a water meter/valve, evolving a device's data over time.
+
+    Consumption events, supply pressure dips and leaks are drawn from `seed`
+    as a schedule in simulated seconds, so the same seed and the same times
+    always give the same readings. The simulation runs in fixed steps up to
+    the time it is asked for; commands only change the valve and alarm.
+
+    Only the keys present in the device data are written, each in the format
+    of its original value (e.g. 3700, "3700 mbar" or "Vol[L]268289").
+    """
+
+    def __init__(
+        self,
+        data,
+        scenario="household",
+        seed=0,
+        events_per_hour=6.0,
+        dips_per_hour=0.5,
+        leak_flow=30.0,
+        leak_time_limit=1800,
+        leak_volume_limit=300.0,
+        max_flow=3000.0,
+        valve_seconds=5,
+    ):
+        self.rng = random.Random(seed)
+        self.templates = {
+            key: data[key]
+            for key in ("getFLO", "getVOL", "getBAR", "getAVO", "getNPS", "getALA")
+            if key in data
+        }
+        self.templates["getVLV"] = data.get("getVLV")
+        # Only devices with a valve have leak protection
+        self.has_valve = "getVLV" in data
+
+        options = SCENARIOS[scenario]
+        self.events_per_hour = events_per_hour if options.get("consumption") else 0
+        self.dips_per_hour = dips_per_hour if options.get("pressure_dips") else 0
+        self.leak_at = options.get("leak_at")
+        self.burst_at = options.get("burst_at")
+        self.leak_flow = leak_flow
+        self.leak_time_limit = leak_time_limit
+        self.leak_volume_limit = leak_volume_limit
+        self.max_flow = max_flow
+        self.valve_seconds = valve_seconds
+
+        # Device state, starting from the fixture values
+        self.time = 0.0
+        self.volume = _number(data.get("getVOL"), 0.0)
+        self.nominal_pressure = _number(data.get("getBAR"), 4000.0)
+        self.pressure = self.nominal_pressure
+        self.flow = 0.0
+        self.draw_volume = 0.0
+        self.draw_seconds = 0.0
+        self.no_pulse = _number(data.get("getNPS"), 0.0)
+        self.alarm = NO_ALARM
+        self.valve = int(_number(data.get("getVLV"), VALVE_OPEN))
+        self.valve_target = None
+        self.valve_done = 0.0
+
+        # Schedules of (start, end, value), drawn ahead so they only depend on the seed
+        self._draws = []
+        self._dips = []
+        self._scheduled_until = 0.0
+
+    def advance(self, until):
+        """Run the simulation up to `until` simulated seconds."""
+        while self.time + TICK <= until:
+            self._schedule(self.time + TICK)
+            self._step()
+
+    def _schedule(self, until):
+        """Draw consumption events and pressure dips starting before `until`."""
+        while self._scheduled_until < until:
+            start = self._scheduled_until
+            end = start + 3600
+            self._draws += self._draw_events(start, end, self.events_per_hour, 60)
+            self._dips += self._draw_events(start, end, self.dips_per_hour, 300)
+            self._scheduled_until = end
+
+    def _draw_events(self, start, end, per_hour, mean_duration):
+        events = []
+        if not per_hour:
+            return events
+        at = start + self.rng.expovariate(per_hour / 3600)
+        while at < end:
+            duration = self.rng.expovariate(1 / mean_duration)
+            size = self.rng.uniform(0, 1)
+            events.append((at, at + duration, size))
+            at += self.rng.expovariate(per_hour / 3600)
+        return events
+
+    def _step(self):
+        now = self.time = self.time + TICK
+
+        # Water only flows while the valve is open
+        demand = sum(
+            200 + size * 1000 for start, end, size in self._draws if start <= now < end
+        )
+        if self.leak_at is not None and now >= self.leak_at:
+            demand += self.leak_flow
+        if self.burst_at is not None and now >= self.burst_at:
+            demand += self.max_flow * 1.5
+        self._draws = [event for event in self._draws if event[1] > now]
+        self.flow = demand if self.valve == VALVE_OPEN else 0.0
+
+        if self.flow:
+            self.volume += self.flow * TICK / 3600
+            self.draw_volume += self.flow * TICK / 3600
+            self.draw_seconds += TICK
+            self.no_pulse = 0.0
+        else:
+            self.draw_volume = 0.0
+            self.draw_seconds = 0.0
+            self.no_pulse += TICK
+
+        # Pressure sags with the flow and during supply dips
+        dip = sum(
+            1000 + size * 1000 for start, end, size in self._dips if start <= now < end
+        )
+        self._dips = [event for event in self._dips if event[1] > now]
+        self.pressure = max(
+            0.0,
+            self.nominal_pressure - 0.8 * self.flow - dip + self.rng.gauss(0, 20),
+        )
+
+        # Leak protection closes the valve
+        if self.has_valve and self.alarm == NO_ALARM and self.valve == VALVE_OPEN:
+            if self.flow > self.max_flow:
+                self._raise_alarm(ALARM_MAX_FLOW)
+            elif self.draw_volume > self.leak_volume_limit:
+                self._raise_alarm(ALARM_LEAKAGE_VOLUME)
+            elif self.draw_seconds > self.leak_time_limit:
+                self._raise_alarm(ALARM_LEAKAGE_TIME)
+
+        if self.valve_target is not None and now >= self.valve_done:
+            self.valve, self.valve_target = self.valve_target, None
+
+    def _raise_alarm(self, alarm):
+        self.alarm = alarm
+        self.move_valve(VALVE_CLOSED)
+
+    def move_valve(self, target):
+        """Start moving the valve to VALVE_OPEN or VALVE_CLOSED."""
+        if target == (self.valve_target or self.valve):
+            return
+        self.valve = VALVE_OPENING if target == VALVE_OPEN else VALVE_CLOSING
+        self.valve_target = target
+        self.valve_done = self.time + self.valve_seconds
+
+    def on_set(self, command, value):
+        """Apply a /set/<command>/<value> request to the simulated device."""
+        command = command.upper()
+        if command == "AB" and value is not None:
+            close = value.lower() in ("2", "true")
+            self.move_valve(VALVE_CLOSED if close else VALVE_OPEN)
+        elif command == "ALA":
+            self.alarm = NO_ALARM
+
+    def sync(self, data, now):
+        """Run the simulation up to `now` and write the readings into the device data."""
+        self.advance(now)
+        self.write(data)
+
+    def write(self, data):
+        """Write the current readings into the device data."""
+        readings = {
+            "getFLO": self.flow,
+            "getVOL": self.volume,
+            "getBAR": self.pressure,
+            "getAVO": self.draw_volume * 1000,
+            "getNPS": self.no_pulse,
+            "getALA": self.alarm,
+        }
+        for key, template in self.templates.items():
+            if key == "getVLV":
+                if template is not None:
+                    data[key] = _format_like(template, self.valve)
+            elif key == "getALA":
+                data[key] = self.alarm if template.isupper() else self.alarm.lower()
+            else:
+                data[key] = _format_like(template, readings[key])
+
+
+def _number(value, default):
+    """Extract the number from a raw value such as 3700, "3700 mbar" or "0mL"."""
+    match = re.search(r"-?\d+(?:[.,]\d+)?", str(value)) if value is not None else None
+    if match is None:
+        return default
+    return float(match.group(0).replace(",", "."))
+
+
+def _format_like(template, number):
+    """Format a number like the original value: a number, or the same string around it."""
+    if isinstance(template, (int, float)):
+        return round(number)
+    return re.sub(r"-?\d+(?:[.,]\d+)?", str(round(number)), str(template), count=1)
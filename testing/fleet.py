@@ -0,0 +1,318 @@
+import argparse
+import asyncio
+import random
+
+from aiohttp import web
+
+from dynamics import SCENARIOS, DeviceDynamics, SimulationClock
+from serve import DEVICE_CONFIGS, handle_get, handle_set_dynamics, read_device_data
+
+# Port the integration's BASE_URLs expect
+DEVICE_PORT = 5333
+
+# Makes served by default, one after another until the fleet is complete
+FLEET_DEVICES = ["pontos", "safetech", "safetech_v4", "neosoft"]
+
+# How long a request that times out hangs, longer than the integration waits
+HANG_SECONDS = 30
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Serve a fleet of simulated devices with realistic faults."
+    )
+    parser.add_argument(
+        "--devices", type=int, default=10, help="Number of simulated devices."
+    )
+    parser.add_argument(
+        "--makes",
+        nargs="+",
+        choices=DEVICE_CONFIGS.keys(),
+        default=FLEET_DEVICES,
+        help="Device types to serve, assigned to the devices in turn.",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Median delay in seconds added to every response.",
+    )
+    parser.add_argument(
+        "--latency-dist",
+        choices=["fixed", "uniform", "lognormal"],
+        default="fixed",
+        help="Distribution of the delay around --latency.",
+    )
+    parser.add_argument(
+        "--latency-spread",
+        type=float,
+        default=0.5,
+        help="'uniform': +/- this fraction of --latency; 'lognormal': sigma.",
+    )
+    parser.add_argument(
+        "--timeout-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests that hang until the client gives up.",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with HTTP 500.",
+    )
+    parser.add_argument(
+        "--reset-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests whose connection is reset without a response.",
+    )
+    parser.add_argument(
+        "--serialize",
+        action="store_true",
+        help="Let every device answer one request at a time, like the real devices.",
+    )
+    parser.add_argument(
+        "--dynamics",
+        choices=SCENARIOS.keys(),
+        default=None,
+        help="Let flow, volume, pressure, alarms and the valve evolve over time.",
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Simulated seconds per real second for --dynamics.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed for latencies, faults and dynamics.",
+    )
+    return parser.parse_args()
+
+
+class Faults:
+    """Latency distribution and fault rates shared by every device of a fleet."""
+
+    def __init__(
+        self,
+        latency=0.0,
+        latency_dist="fixed",
+        latency_spread=0.5,
+        timeout_rate=0.0,
+        error_rate=0.0,
+        reset_rate=0.0,
+        serialize=False,
+    ):
+        self.latency = latency
+        self.latency_dist = latency_dist
+        self.latency_spread = latency_spread
+        self.timeout_rate = timeout_rate
+        self.error_rate = error_rate
+        self.reset_rate = reset_rate
+        self.serialize = serialize
+
+    @classmethod
+    def from_args(cls, args):
+        return cls(
+            latency=args.latency,
+            latency_dist=args.latency_dist,
+            latency_spread=args.latency_spread,
+            timeout_rate=args.timeout_rate,
+            error_rate=args.error_rate,
+            reset_rate=args.reset_rate,
+            serialize=args.serialize,
+        )
+
+    def delay(self, rng):
+        """Draw the delay of one response."""
+        if not self.latency or self.latency_dist == "fixed":
+            return self.latency
+        if self.latency_dist == "uniform":
+            spread = self.latency * self.latency_spread
+            return max(0.0, rng.uniform(self.latency - spread, self.latency + spread))
+        return rng.lognormvariate(0, self.latency_spread) * self.latency
+
+
+class SimulatedDevice:
+    """One device of the fleet: its own data, random stream and listening address."""
+
+    def __init__(
+        self, index, device_key, host, faults, seed=0, scenario=None, clock=None
+    ):
+        self.index = index
+        self.device_key = device_key
+        self.host = host
+        self.faults = faults
+        self.data = read_device_data(device_key)
+        _identify(self.data, index)
+        self.rng = random.Random(f"{seed}:{index}")
+        self.clock = clock
+        self.dynamics = None
+        if scenario is not None:
+            self.dynamics = DeviceDynamics(self.data, scenario, f"{seed}:{index}")
+        self.lock = asyncio.Lock() if faults.serialize else None
+        self.requests = 0
+        self.runner = None
+
+    @property
+    def address(self):
+        """The address to configure in the integration; the port is always 5333."""
+        return self.host
+
+    def create_app(self):
+        prefix = DEVICE_CONFIGS[self.device_key]["prefix"]
+        app = web.Application()
+        app.router.add_get(prefix + "/get/{command}", self._get)
+        app.router.add_get(prefix + "/set/{command}", self._set)
+        app.router.add_get(prefix + "/set/{command}/{value}", self._set)
+        return app
+
+    async def _get(self, request):
+        def handler():
+            self._simulate()
+            return handle_get(self.device_key, self.data, request.match_info["command"])
+
+        return await self._respond(request, handler)
+
+    async def _set(self, request):
+        command = request.match_info["command"]
+        value = request.match_info.get("value")
+
+        def handler():
+            self._simulate()
+            return handle_set_dynamics(
+                self.device_key, self.data, self.dynamics, command, value
+            )
+
+        return await self._respond(request, handler)
+
+    def _simulate(self):
+        if self.dynamics is not None:
+            self.dynamics.sync(self.data, self.clock.now())
+
+    async def _respond(self, request, handler):
+        """Answer a request like the device would, including latency and faults."""
+        self.requests += 1
+        if self.lock is None:
+            return await self._answer(request, handler)
+        async with self.lock:
+            return await self._answer(request, handler)
+
+    async def _answer(self, request, handler):
+        faults = self.faults
+        # Draw every decision up front, so the stream only depends on the seed
+        delay = faults.delay(self.rng)
+        fault = self.rng.random()
+
+        if fault < faults.timeout_rate:
+            # The client gives up long before this answer
+            await asyncio.sleep(HANG_SECONDS)
+            return web.json_response({"error": "Simulated timeout"}, status=504)
+        fault -= faults.timeout_rate
+
+        await asyncio.sleep(delay)
+
+        if fault < faults.reset_rate:
+            # Drop the connection; the response below is never sent
+            request.transport.abort()
+            return web.Response()
+        fault -= faults.reset_rate
+
+        if fault < faults.error_rate:
+            return web.json_response({"error": "Simulated failure"}, status=500)
+
+        response_data, status = handler()
+        return web.json_response(response_data, status=status)
+
+
+def _identify(data, index):
+    """Give a device its own serial number and MAC addresses, as Home Assistant
+    identifies devices and entities by them."""
+    if "getSRN" in data:
+        data["getSRN"] = f"{data['getSRN'][:-4]}{index:04d}"
+    for key in ("getMAC", "getMAC1", "getMAC2"):
+        mac = data.get(key)
+        if isinstance(mac, str) and len(mac) == 17:
+            suffix = f"{index >> 8 & 0xFF:02x}:{index & 0xFF:02x}"
+            data[key] = mac[:-5] + (suffix.upper() if mac.isupper() else suffix)
+
+
+def build_fleet(
+    devices,
+    makes,
+    faults,
+    seed=0,
+    scenario=None,
+    speed=1.0,
+):
+    """Create the simulated devices, assigning the makes in turn.
+
+    Every device gets its own loopback address (127.0.0.1, 127.0.0.2, ...)
+    on port 5333, as the integration's URLs always use that port.
+
+    With a dynamics `scenario`, every device runs its own seeded simulation
+    on a clock shared by the fleet, `speed` times real time.
+    """
+    clock = SimulationClock(speed)
+    fleet = []
+    for index in range(devices):
+        host = f"127.0.{index // 250}.{index % 250 + 1}"
+        fleet.append(
+            SimulatedDevice(
+                index,
+                makes[index % len(makes)],
+                host,
+                faults,
+                seed,
+                scenario,
+                clock,
+            )
+        )
+    return fleet
+
+
+async def start_fleet(fleet):
+    """Start listening for every device of the fleet."""
+    for device in fleet:
+        device.runner = web.AppRunner(device.create_app(), access_log=None)
+        await device.runner.setup()
+        await web.TCPSite(device.runner, device.host, DEVICE_PORT).start()
+
+
+async def stop_fleet(fleet):
+    for device in fleet:
+        if device.runner is not None:
+            await device.runner.cleanup()
+            device.runner = None
+
+
+async def main(args):
+    faults = Faults.from_args(args)
+    fleet = build_fleet(
+        args.devices,
+        args.makes,
+        faults,
+        args.seed,
+        args.dynamics,
+        args.speed,
+    )
+    await start_fleet(fleet)
+
+    for device in fleet:
+        print(f"{device.address:<20} {device.device_key}")
+    print(f"Serving {len(fleet)} devices, press Ctrl+C to stop.")
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stop_fleet(fleet)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main(parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,349 @@
+import argparse
+import asyncio
+import bisect
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+
+from aiohttp import web
+
+from dynamics import SimulationClock
+from fleet import DEVICE_PORT
+
+# Options holding a number of seconds, shortened by --speed in --run
+INTERVAL_OPTIONS = ("fetch_interval", "min_fetch_interval", "max_fetch_interval")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Serve traffic captures recorded by the integration, each as its own "
+            "device, at the original or an accelerated speed."
+        )
+    )
+    parser.add_argument("captures", nargs="+", help="Capture files (.ndjson[.gz]).")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Capture seconds replayed per real second.",
+    )
+    parser.add_argument(
+        "--no-latency",
+        action="store_true",
+        help="Answer right away instead of after the recorded response time.",
+    )
+    parser.add_argument(
+        "--run",
+        action="store_true",
+        help=(
+            "Set up the integration in Home Assistant against the replayed devices "
+            "until the captures end, and print the polls and entity states as JSON."
+        ),
+    )
+    parser.add_argument(
+        "--compare",
+        default=None,
+        help="With --run, report entity states that differ from this earlier output.",
+    )
+    parser.add_argument(
+        "--output", default=None, help="With --run, write the JSON to this file."
+    )
+    return parser.parse_args()
+
+
+def read_capture(path):
+    """Return the header and the records of a capture, with every body filled in."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    if not lines or "capture" not in lines[0]:
+        raise ValueError(f"{path} is not a traffic capture")
+
+    header, records = lines[0], lines[1:]
+    bodies = {}
+    for record in records:
+        if record.pop("same", None):
+            record["body"] = bodies[record["path"]]
+        elif "body" in record:
+            bodies[record["path"]] = record["body"]
+    return header, records
+
+
+class ReplayDevice:
+    """Answers every path of one capture with the response recorded at that time.
+
+    At replay time t (capture seconds, on `clock`), a path gets the last
+    response recorded for it at or before t, or its first one before that.
+    Requests that failed in the capture fail again: the connection is dropped.
+    """
+
+    def __init__(self, header, records, host, clock, latency=True):
+        self.header = header
+        self.host = host
+        self.clock = clock
+        self.latency = latency
+        self.paths = {}
+        for record in records:
+            self.paths.setdefault(record["path"], []).append(record)
+        self.times = {
+            path: [record["t"] for record in responses]
+            for path, responses in self.paths.items()
+        }
+        self.duration = max((record["t"] for record in records), default=0.0)
+        self.runner = None
+
+    @property
+    def address(self):
+        """The address to configure in the integration; the port is always 5333."""
+        return self.host
+
+    def create_app(self):
+        app = web.Application()
+        app.router.add_get("/{path:.*}", self._handle)
+        return app
+
+    def response_at(self, path, t):
+        """Return the record answering `path` at capture time `t`, or None."""
+        responses = self.paths.get(path)
+        if responses is None:
+            return None
+        position = max(bisect.bisect_right(self.times[path], t) - 1, 0)
+        return responses[position]
+
+    async def _handle(self, request):
+        record = self.response_at(request.raw_path, self.clock.now())
+        if record is None:
+            return web.json_response({"error": "Not in capture"}, status=404)
+
+        if self.latency:
+            await asyncio.sleep(record["ms"] / 1000 / self.clock.speed)
+        if record["status"] is None:
+            request.transport.abort()
+            return web.Response()
+        return web.Response(
+            status=record["status"],
+            text=record.get("body", ""),
+            content_type="application/json",
+        )
+
+
+def build_replay(captures, speed=1.0, latency=True):
+    """Create one device per capture file, each on its own loopback address."""
+    clock = SimulationClock(speed)
+    devices = []
+    for index, path in enumerate(captures):
+        header, records = read_capture(path)
+        host = f"127.0.{index // 250}.{index % 250 + 1}"
+        devices.append(ReplayDevice(header, records, host, clock, latency))
+    return devices
+
+
+async def start_replay(devices):
+    for device in devices:
+        device.runner = web.AppRunner(device.create_app(), access_log=None)
+        await device.runner.setup()
+        await web.TCPSite(device.runner, device.host, DEVICE_PORT).start()
+
+
+async def stop_replay(devices):
+    for device in devices:
+        if device.runner is not None:
+            await device.runner.cleanup()
+            device.runner = None
+
+
+async def serve(args):
+    devices = build_replay(args.captures, args.speed, not args.no_latency)
+    await start_replay(devices)
+
+    for device, path in zip(devices, args.captures):
+        print(f"{device.address:<20} {device.header['make']:<30} {path}")
+    print(f"Serving {len(devices)} captures, press Ctrl+C to stop.")
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stop_replay(devices)
+
+
+async def run(args, config_dir):
+    """Replay the captures through the coordinator and every platform's entities."""
+    from bench_e2e import percentiles, start_hass, time_polls
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import EVENT_STATE_CHANGED
+    from homeassistant.setup import async_setup_component
+    from homeassistant.util import slugify
+
+    from custom_components.hass_pontos.config_flow import PontosConfigFlow
+    from custom_components.hass_pontos.const import (
+        CONF_DEVICE_NAME,
+        CONF_IP_ADDRESS,
+        CONF_MAKE,
+        DOMAIN,
+        MAKES,
+    )
+    from custom_components.hass_pontos.binary_sensor import COORDINATOR_BINARY_SENSORS
+    from custom_components.hass_pontos.limiter import get_limiter
+    from custom_components.hass_pontos.sensor import COORDINATOR_SENSORS
+
+    devices = build_replay(args.captures, args.speed, not args.no_latency)
+    clock = devices[0].clock
+    platforms = {
+        platform
+        for device in devices
+        for platform in MAKES[device.header["make"]].PLATFORMS
+    }
+
+    hass = await start_hass(config_dir)
+    for domain in [DOMAIN, *platforms]:
+        await async_setup_component(hass, domain, {})
+
+    # State changes, with the capture time at which they were written
+    timeline = []
+
+    def record_state(event):
+        new_state = event.data["new_state"]
+        timeline.append(
+            [
+                round(clock.now(), 1),
+                event.data["entity_id"],
+                new_state.state if new_state is not None else None,
+            ]
+        )
+
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, record_state)
+
+    await start_replay(devices)
+    # Capture time 0 is when the integration is set up, like when it was recorded
+    clock.start = time.monotonic()
+
+    for device in devices:
+        header = device.header
+        options = dict(header.get("options", {}))
+        for key in INTERVAL_OPTIONS:
+            if key in options:
+                options[key] = options[key] / args.speed
+        options[CONF_IP_ADDRESS] = device.address
+        scale_limiter(get_limiter(hass, device.address), args.speed)
+        entry = ConfigEntry(
+            version=PontosConfigFlow.VERSION,
+            minor_version=1,
+            domain=DOMAIN,
+            title=header["device_name"],
+            data={CONF_DEVICE_NAME: header["device_name"], CONF_MAKE: header["make"]},
+            source="user",
+            options=options,
+        )
+        await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+
+    durations = []
+    for entry_data in hass.data[DOMAIN]["entries"].values():
+        coordinator = entry_data["coordinator"]
+        coordinator.slow_poll_interval /= args.speed
+        time_polls(coordinator, durations)
+
+    remaining = max(device.duration for device in devices) - clock.now()
+    await asyncio.sleep(max(remaining, 0) / args.speed)
+    unsub()
+
+    # Coordinator sensors depend on timing rather than on the device's answers
+    entity_ids = {entity_id for _, entity_id, _ in timeline}
+    coordinator_suffixes = tuple(
+        f"_{slugify(config['name'])}"
+        for config in [
+            *COORDINATOR_SENSORS.values(),
+            *COORDINATOR_BINARY_SENSORS.values(),
+        ]
+    )
+    states = {}
+    coordinator_states = {}
+    for state in hass.states.async_all():
+        if state.entity_id in entity_ids:
+            if state.entity_id.endswith(coordinator_suffixes):
+                coordinator_states[state.entity_id] = state.state
+            else:
+                states[state.entity_id] = state.state
+
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    await hass.async_stop(force=True)
+    await stop_replay(devices)
+
+    return {
+        "captures": args.captures,
+        "speed": args.speed,
+        "polls": len(durations),
+        "poll_ms": percentiles(durations),
+        "state_writes": len(timeline),
+        "timeline": timeline,
+        "states": dict(sorted(states.items())),
+        "coordinator_states": dict(sorted(coordinator_states.items())),
+    }
+
+
+def scale_limiter(limiter, speed):
+    """Let a device's rate limiter allow `speed` times its rate, like the replayed clock."""
+    configure = limiter.configure
+    limiter.configure = lambda rate, burst: configure(rate * speed, burst)
+    limiter.configure(limiter.rate, limiter.burst)
+
+
+def compare(states, path):
+    """Print the entity states that differ from an earlier --run output."""
+    with open(path) as f:
+        expected = json.load(f)["states"]
+    differences = {
+        entity_id: (expected.get(entity_id), states.get(entity_id))
+        for entity_id in expected.keys() | states.keys()
+        if expected.get(entity_id) != states.get(entity_id)
+    }
+    for entity_id, (before, after) in sorted(differences.items()):
+        print(f"{entity_id}: {before!r} -> {after!r}", file=sys.stderr)
+    return not differences
+
+
+def main(args):
+    if not args.run:
+        try:
+            asyncio.run(serve(args))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    # Make the integration importable when running from the testing folder
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    sys.path.insert(0, root)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        # A fresh config dir, so no cached state is reused
+        os.symlink(
+            os.path.join(root, "custom_components"),
+            os.path.join(config_dir, "custom_components"),
+        )
+        result = asyncio.run(run(args, config_dir))
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    print(
+        f"Replayed {len(args.captures)} capture(s): {result['polls']} polls, "
+        f"{result['state_writes']} state writes",
+        file=sys.stderr,
+    )
+    if args.compare and not compare(result["states"], args.compare):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(parse_args()))
@@ -1,8 +1,12 @@
 import argparse
 import json
 import os
+import threading
+import time
 from flask import Flask, jsonify, request
 
+from dynamics import SCENARIOS, DeviceDynamics, SimulationClock
+
 DEVICE_CONFIGS = {
     "safetech": {
         "prefix": "/trio",
@@ -38,6 +42,9 @@ DEVICE_CONFIGS = {
 
 ALL_DEVICE_DATA = {}
 
+# Device type -> DeviceDynamics, for devices whose data evolves over time
+ALL_DEVICE_DYNAMICS = {}
+
 
 def parse_args():
     parser = argparse.ArgumentParser(
@@ -55,20 +62,52 @@ def parse_args():
     parser.add_argument(
         "--host", type=str, default="0.0.0.0", help="Host to run the Flask app on."
     )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Delay in seconds added to every response, to mimic a slow device.",
+    )
+    parser.add_argument(
+        "--dynamics",
+        choices=SCENARIOS.keys(),
+        default=None,
+        help="Let flow, volume, pressure, alarms and the valve evolve over time.",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Seed for the --dynamics scenario."
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Simulated seconds per real second for --dynamics.",
+    )
     return parser.parse_args()
 
 
+def read_device_data(device_key):
+    """
+    Return a fresh copy of the fixture data for a device type.
+
+    Raises FileNotFoundError or json.JSONDecodeError if the JSON file is
+    missing or invalid; load_device_data falls back to an empty dict instead.
+    """
+    filename = DEVICE_CONFIGS[device_key]["filename"]
+    path = os.path.join(os.path.dirname(__file__), filename)
+
+    with open(path, "r") as f:
+        return json.load(f)
+
+
 def load_device_data(device_key):
     """
     Load the JSON file for the selected device into memory.
     """
-    config = DEVICE_CONFIGS[device_key]
-    filename = config["filename"]
-    path = os.path.join(os.path.dirname(__file__), filename)
+    filename = DEVICE_CONFIGS[device_key]["filename"]
 
     try:
-        with open(path, "r") as f:
-            ALL_DEVICE_DATA[device_key] = json.load(f)
+        ALL_DEVICE_DATA[device_key] = read_device_data(device_key)
         print(f"Loaded {filename} for '{device_key}'.")
     except (FileNotFoundError, json.JSONDecodeError):
         ALL_DEVICE_DATA[device_key] = {}
@@ -77,127 +116,195 @@ def load_device_data(device_key):
         )
 
 
-def register_device_endpoints(app, device_key):
+def load_device_dynamics(device_key, scenario, seed=0):
     """
-    Dynamically create the “/get” and “/set” routes for the chosen device type.
-    Ensures the same valve/profile logic is implemented for each device.
+    Let the loaded data of a device evolve over time following a scenario.
     """
-    prefix = DEVICE_CONFIGS[device_key]["prefix"]
-    defaults = DEVICE_CONFIGS[device_key]["defaults"]
+    ALL_DEVICE_DYNAMICS[device_key] = DeviceDynamics(
+        ALL_DEVICE_DATA[device_key], scenario, seed
+    )
+    print(f"Simulating '{scenario}' for '{device_key}' with seed {seed}.")
 
-    @app.route(prefix + "/get/all", methods=["GET"])
-    def get_all():
-        return jsonify(ALL_DEVICE_DATA[device_key])
 
-    @app.route(prefix + "/get/<command>", methods=["GET"])
-    def get_command(command):
-        data = ALL_DEVICE_DATA[device_key]
-        cmd_upper = command.upper()
-        response_data = {}
+def handle_get(device_key, data, command):
+    """
+    Answer a “/get/<command>” request from the device data.
+    Returns (response data, HTTP status); “all” returns the whole data.
+    """
+    defaults = DEVICE_CONFIGS[device_key]["defaults"]
+    cmd_upper = command.upper()
+    response_data = {}
+
+    if cmd_upper == "ALL":
+        return data, 200
 
-        # --- Example for valve status:
-        if cmd_upper == "VLV":
-            response_data["getVLV"] = data.get("getVLV", defaults["getVLV"])
+    # --- Example for valve status:
+    if cmd_upper == "VLV":
+        response_data["getVLV"] = data.get("getVLV", defaults["getVLV"])
 
-        # --- Example for the profile:
-        elif cmd_upper == "PRF":
-            response_data["getPRF"] = data.get("getPRF", defaults["getPRF"])
+    # --- Example for the profile:
+    elif cmd_upper == "PRF":
+        response_data["getPRF"] = data.get("getPRF", defaults["getPRF"])
 
-        # --- Example for the alarm:
-        elif cmd_upper == "ALA":
-            response_data["getALA"] = data.get("getALA", defaults["getALA"])
+    # --- Example for the alarm:
+    elif cmd_upper == "ALA":
+        response_data["getALA"] = data.get("getALA", defaults["getALA"])
 
-        # --- Example for the Pontos “CND” (water conductivity/hardness):
-        elif cmd_upper == "CND":
-            # Some devices might not have CND at all. For Pontos, it’s used. If you want it for others, add it similarly.
-            response_data["getCND"] = data.get("getCND", defaults.get("getCND", "300"))
+    # --- Example for the Pontos “CND” (water conductivity/hardness):
+    elif cmd_upper == "CND":
+        # Some devices might not have CND at all. For Pontos, it’s used. If you want it for others, add it similarly.
+        response_data["getCND"] = data.get("getCND", defaults.get("getCND", "300"))
 
+    else:
+        # Fallback
+        key = "get" + cmd_upper
+        if key in data:
+            response_data[key] = data[key]
         else:
-            # Fallback
-            key = "get" + cmd_upper
-            if key in data:
-                response_data[key] = data[key]
-            else:
-                response_data = {"error": f"Unknown command: {command}"}
+            response_data = {"error": f"Unknown command: {command}"}
 
-        return jsonify(response_data)
+    return response_data, 200
 
-    @app.route(prefix + "/set/<command>", methods=["GET"])
-    @app.route(prefix + "/set/<command>/<value>", methods=["GET"])
-    def set_command(command, value=None):
-        data = ALL_DEVICE_DATA[device_key]
-        cmd_upper = command.upper()
-        response_data = {}
-
-        # The AB command is used for opening/closing the valve.
-        if cmd_upper == "AB":
-            if value is None:
-                return jsonify({"error": "Missing value for AB command"}), 400
-
-            # Check which device we’re dealing with:
-            if device_key == "pontos" or device_key == "safetech_v4":
-                # For Pontos, "1" => open, "2" => close
-                if value == "1":
-                    data["getVLV"] = 20  # 20 => valve open
-                    data["setAB"] = "open"
-                    response_data["getVLV"] = data["getVLV"]
-                    response_data["setAB"] = "open"
-                elif value == "2":
-                    data["getVLV"] = 10  # 10 => valve closed
-                    data["setAB"] = "close"
-                    response_data["getVLV"] = data["getVLV"]
-                    response_data["setAB"] = "close"
-                else:
-                    return (
-                        jsonify({"error": f"Invalid AB value for Pontos: {value}"}),
-                        400,
-                    )
-            else:
-                # For Trio / SafeTec, "true" => closed (10), "false" => open (20)
-                bool_val = value.lower() == "true"
-                data["setAB"] = bool_val
-                # If “true” => valve closed => getVLV=10; “false” => valve open => getVLV=20
-                data["getVLV"] = 10 if bool_val else 20
-                response_data["setAB"] = bool_val
+
+def handle_set(device_key, data, command, value=None):
+    """
+    Apply a “/set/<command>/<value>” request to the device data in place.
+    Returns (response data, HTTP status).
+    """
+    cmd_upper = command.upper()
+    response_data = {}
+
+    # The AB command is used for opening/closing the valve.
+    if cmd_upper == "AB":
+        if value is None:
+            return {"error": "Missing value for AB command"}, 400
+
+        # Check which device we’re dealing with:
+        if device_key == "pontos" or device_key == "safetech_v4":
+            # For Pontos, "1" => open, "2" => close
+            if value == "1":
+                data["getVLV"] = 20  # 20 => valve open
+                data["setAB"] = "open"
+                response_data["getVLV"] = data["getVLV"]
+                response_data["setAB"] = "open"
+            elif value == "2":
+                data["getVLV"] = 10  # 10 => valve closed
+                data["setAB"] = "close"
                 response_data["getVLV"] = data["getVLV"]
+                response_data["setAB"] = "close"
+            else:
+                return {"error": f"Invalid AB value for Pontos: {value}"}, 400
+        else:
+            # For Trio / SafeTec, "true" => closed (10), "false" => open (20)
+            bool_val = value.lower() == "true"
+            data["setAB"] = bool_val
+            # If “true” => valve closed => getVLV=10; “false” => valve open => getVLV=20
+            data["getVLV"] = 10 if bool_val else 20
+            response_data["setAB"] = bool_val
+            response_data["getVLV"] = data["getVLV"]
+
+    # Profile switching logic:
+    elif cmd_upper == "PRF":
+        if value is None:
+            return {"error": "Missing value for PRF command"}, 400
+        try:
+            profile_num = int(value)
+        except ValueError:
+            return {"error": f"Invalid profile number: {value}"}, 400
+
+        data["getPRF"] = profile_num
+        response_data["setPRF"] = profile_num
 
-        # Profile switching logic:
-        elif cmd_upper == "PRF":
-            if value is None:
-                return jsonify({"error": "Missing value for PRF command"}), 400
-            try:
-                profile_num = int(value)
-            except ValueError:
-                return jsonify({"error": f"Invalid profile number: {value}"}), 400
-
-            data["getPRF"] = profile_num
-            response_data["setPRF"] = profile_num
-
-        # --- Example of the special “CND” set command (optional):
-        #     If you wanted to allow setting getCND, do something like:
-        elif cmd_upper == "CND":
-            if not value:
-                return jsonify({"error": "Missing value for CND"}), 400
-            data["getCND"] = value
-            response_data["setCND"] = value
+    # --- Example of the special “CND” set command (optional):
+    #     If you wanted to allow setting getCND, do something like:
+    elif cmd_upper == "CND":
+        if not value:
+            return {"error": "Missing value for CND"}, 400
+        data["getCND"] = value
+        response_data["setCND"] = value
 
+    else:
+        # Fallback
+        if value is None:
+            data[f"set{cmd_upper}"] = "OK"
+            response_data[f"set{cmd_upper}"] = "OK"
         else:
-            # Fallback
-            if value is None:
-                data[f"set{cmd_upper}"] = "OK"
-                response_data[f"set{cmd_upper}"] = "OK"
-            else:
-                data[f"set{cmd_upper}{value}"] = "OK"
-                response_data[f"set{cmd_upper}{value}"] = "OK"
+            data[f"set{cmd_upper}{value}"] = "OK"
+            response_data[f"set{cmd_upper}{value}"] = "OK"
+
+    return response_data, 200
+
+
+def handle_set_dynamics(device_key, data, dynamics, command, value=None):
+    """
+    Apply a “/set/<command>/<value>” request like handle_set, then let the
+    device dynamics react (e.g. start moving the valve) before answering.
+    The response reports the data as it is after both, e.g. getVLV 11 while
+    the valve is closing. Returns (response data, HTTP status).
+    """
+    response_data, status = handle_set(device_key, data, command, value)
+    if dynamics is None or status != 200:
+        return response_data, status
+
+    dynamics.on_set(command, value)
+    dynamics.write(data)
+    return {key: data.get(key, reply) for key, reply in response_data.items()}, status
+
+
+def register_device_endpoints(app, device_key):
+    """
+    Dynamically create the “/get” and “/set” routes for the chosen device type.
+    The valve/profile logic shared by every device is in handle_get/handle_set.
+    """
+    prefix = DEVICE_CONFIGS[device_key]["prefix"]
+    # The dev server is threaded, the simulation must step one request at a time
+    lock = threading.Lock()
+
+    def simulate(clock):
+        dynamics = ALL_DEVICE_DYNAMICS.get(device_key)
+        if dynamics is not None:
+            dynamics.sync(ALL_DEVICE_DATA[device_key], clock.now())
+        return dynamics
+
+    @app.route(prefix + "/get/all", methods=["GET"])
+    def get_all():
+        return get_command("all")
 
-        return jsonify(response_data)
+    @app.route(prefix + "/get/<command>", methods=["GET"])
+    def get_command(command):
+        with lock:
+            simulate(app.config["CLOCK"])
+            response_data, status = handle_get(
+                device_key, ALL_DEVICE_DATA[device_key], command
+            )
+            return jsonify(response_data), status
 
+    @app.route(prefix + "/set/<command>", methods=["GET"])
+    @app.route(prefix + "/set/<command>/<value>", methods=["GET"])
+    def set_command(command, value=None):
+        with lock:
+            dynamics = simulate(app.config["CLOCK"])
+            response_data, status = handle_set_dynamics(
+                device_key, ALL_DEVICE_DATA[device_key], dynamics, command, value
+            )
+            return jsonify(response_data), status
 
-def create_app(device_key):
+
+def create_app(device_key, latency=0.0, speed=1.0):
     """
     Create a Flask app that only serves endpoints for the specified device.
+    A non-zero latency delays every request by that many seconds. A device
+    with dynamics (see load_device_dynamics) runs `speed` times real time.
     """
     app = Flask(__name__)
+    app.config["CLOCK"] = SimulationClock(speed)
+
+    if latency:
+
+        @app.before_request
+        def inject_latency():
+            time.sleep(latency)
+
     register_device_endpoints(app, device_key)
     return app
 
@@ -208,8 +315,10 @@ if __name__ == "__main__":
 
     # Load the JSON data for that device
     load_device_data(device_key)
+    if args.dynamics:
+        load_device_dynamics(device_key, args.dynamics, args.seed)
 
     # Create and run the Flask app with that device’s routes
-    app = create_app(device_key)
+    app = create_app(device_key, latency=args.latency, speed=args.speed)
     print(f"Starting Flask app for device: {device_key} on port: {args.port}")
     app.run(host=args.host, port=args.port, debug=True)